@@ -3,10 +3,119 @@ Tools for validating inputs or variables according to specifications detailing w
 
 TODO:
 - Add common specifications already created
-- Change date, time and datetime to use isValid date, time and datetime methods so can call externally
 - Change true_false to error if not one of the possibilities
 """
 
+import bisect
+import csv
+import functools
+import importlib
+import itertools
+import json
+import math
+import mmap
+import operator
+import os
+import re
+import sys
+from time import perf_counter
+
+__all__ = [
+    "Spec", "SpecStr", "SpecStrFile", "SpecNum", "SpecNumRange", "SpecNumList", "SpecRecord", "SpecAll", "SpecAny", "SpecNot",
+    "compile_spec", "is_valid", "validate_record", "assert_valid", "validate_input", "true_false", "date", "time", "datetime",
+    "is_valid_date", "is_valid_time", "is_valid_datetime", "parse_dates", "parse_times", "parse_datetimes",
+    "is_valid_array", "is_valid_buffer", "validate_stream", "validate_many", "write_vocabulary", "PrefixValidator", "cached_specs",
+    "BatchInputError", "batch_mode", "batch_summary", "ValidationServer", "ValidationClient",
+    "enable_instrumentation", "disable_instrumentation", "reset_instrumentation", "instrumentation_snapshot", "instrumentation_prometheus",
+    "specTrueFalse", "specDay", "specMonth", "specYear", "specHour", "specMinuteSecond",
+]
+
+# numpy and asyncio are slow to import and only needed by some functions, so they are imported the first time they are needed, as are other modules only some functions use
+_np = None
+_asyncio = None
+
+# marks a column which is missing from a row
+_MISSING = object()
+# the most valid values of a field of a record which are looked up rather than validated
+_MAX_KNOWN = 4096
+
+# the number of times a specification has been changed after being compiled
+_spec_changes = 0
+
+# the specifications made by 'Spec.shared' with the parameters they were made with
+_shared_specs = {}
+
+# while instrumentation is enabled, each specification validated with to what has been recorded about it, otherwise None
+_instrumentation = None
+# what instrumentation has recorded by the name or repr of the specifications
+_instrumentation_stats = {}
+# the names given to specifications to record them under
+_instrumentation_names = {}
+# the upper bounds in seconds of how long validating can take for each bucket recorded by instrumentation
+_LATENCY_BUCKETS = [0.0000005, 0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.001, 0.01]
+
+_MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+_MONTH_NAMES = [month.capitalize() for month in _MONTHS]
+# every way a month can be input, the first 3 letters of its name or its number, to its number
+_MONTH_NUMBERS = dict(zip(_MONTHS + [str(number) for number in range(1, 13)], list(range(1, 13)) * 2))
+_MONTH_INPUTS = list(_MONTH_NUMBERS)
+# the largest integer where it and every integer below it are exactly floats
+_MAX_EXACT_FLOAT = 2 ** 53
+# the number of days in each month by its number, in a normal year and a leap year
+_MONTH_DAYS = [
+    [None, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31],
+    [None, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31],
+]
+# the suffix of each day by its last digit, the same as has always been used so 11 is '11st'
+_DAY_SUFFIXES = ["th", "st", "nd", "rd", "th", "th", "th", "th", "th", "th"]
+# every how many validations with a 'SpecAll' or 'SpecAny' its checks are timed, and reordered
+_ORDER_SAMPLE = 16
+_ORDER_EVERY = 1024
+
+# whether 'validate_input' reads standard input in batch mode, True always, False never or None only when it isn't interactive
+_batch_enabled = None
+# the most lines in a row batch mode rejects before giving up
+_batch_max_rejected = 1000
+# reads standard input in batch mode, made the first time it is needed
+_batch = None
+
+# the version of the format of the caches made by 'cached_specs', changed whenever it changes
+_CACHE_VERSION = 2
+
+# the start of a number as 'float' reads it: a sign, whole digits, a decimal point, decimal digits and an exponent
+_NUMBER_PREFIX = re.compile(r"([+-]?)(\d*)(\.?)(\d*)([eE][+-]?\d*)?")
+# the words 'float' reads as numbers
+_NUMBER_WORDS = ["inf", "infinity", "nan"]
+# the separator and the positions of the year, month and day of each form dates can be parsed from
+_DATE_INPUT_FORMS = {"exact": ("-", 0, 1, 2), "uk": ("/", 2, 1, 0), "us": ("/", 2, 0, 1)}
+
+def _import_numpy(purpose):
+    """
+    Private method which imports numpy the first time it is needed, raising an ImportError saying it is needed for 'purpose' if it isn't installed
+    """
+
+    global _np
+    if _np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("numpy is required to " + purpose) from None
+        _np = numpy
+
+    return _np
+
+def _import_asyncio():
+    """
+    Private method which imports asyncio the first time it is needed
+    """
+
+    global _asyncio
+    if _asyncio is None:
+        import asyncio
+        _asyncio = asyncio
+
+    return _asyncio
+
 def _round(num, digits):
     """
     Private rounding method which uses the built-in round function but fixes a problem:
@@ -18,6 +127,41 @@ def _round(num, digits):
 
     return round(num, digits) if digits != 0 else round(num)
 
+class _SpecList(list):
+    """
+    Private class for the lists of a specification, such as its allowed strings, which are copied from those given to it when it is first compiled or shared
+    and tell it when they are changed so it is compiled again, or refuse to be changed if it is shared
+    """
+
+    _owner = None
+
+def _changing(method):
+    """
+    Private method which returns 'method' of a container of a specification, first telling the specification it is being changed
+    """
+
+    def changing(self, *args, **kwargs):
+        if self._owner is not None:
+            self._owner._changing()
+        return method(self, *args, **kwargs)
+
+    changing.__name__ = method.__name__
+
+    return changing
+
+class _SpecDict(dict):
+    """
+    Private class for the dictionaries of a specification, such as the fields of a record, which are copied from those given to it when it is first compiled or shared
+    and tell it when they are changed so it is compiled again, or refuse to be changed if it is shared
+    """
+
+    _owner = None
+
+for _name in ["append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse", "__setitem__", "__delitem__", "__iadd__", "__imul__"]:
+    setattr(_SpecList, _name, _changing(getattr(list, _name)))
+for _name in ["pop", "popitem", "clear", "update", "setdefault", "__setitem__", "__delitem__", "__ior__"]:
+    setattr(_SpecDict, _name, _changing(getattr(dict, _name)))
+
 class Spec:
     """
     Specifies the format of data in general
@@ -26,6 +170,8 @@ class Spec:
     :param extra_values: A list of extra values it can take to always be true, even if not the datatype. Default: None
     """
 
+    __slots__ = ("type", "extra_values", "_msg", "_validator", "_frozen", "_cache_size", "_cache")
+
     def __init__(self, type_, extra_values=None):
         """
         Specifies the format of data
@@ -36,15 +182,161 @@ class Spec:
 
         assert isinstance(type_, type), "param type_ must be a datatype"
 
-        self.type = type_
-        self.extra_values = extra_values
-        self.msg = "Must be type {}".format(str(type_)[8:-2])
-        if extra_values:
-            self.msg += " or one of the following: " + ", ".join(["'{}'".format(value) for value in extra_values])
+        # only the private attributes read every time it is used are set here, the others are read with defaults until they are set
+        object.__setattr__(self, "_msg", None)
+        object.__setattr__(self, "_validator", None)
+        object.__setattr__(self, "type", type_)
+        object.__setattr__(self, "extra_values", extra_values)
+
+    @classmethod
+    def shared(cls, *args, **kwargs):
+        """
+        Return a specification made with these parameters which can't be changed, using the same one as last time it was called with the same parameters
+
+        :param args: The parameters to make the specification with
+        :param kwargs: The keyword parameters to make the specification with
+        :return: The specification
+        """
+
+        try:
+            key = (cls, _shared_key(args), tuple(kwargs), _shared_key(kwargs.values()))
+            return _shared_specs[key]
+        except TypeError:
+            key = None
+        except KeyError:
+            pass
+
+        spec = cls(*args, **kwargs)
+        spec._own()
+        object.__setattr__(spec, "_frozen", True)
+        if key is not None:
+            _shared_specs[key] = spec
+
+        return spec
+
+    @property
+    def msg(self):
+        """
+        The message describing the specification, made the first time it is needed
+        """
+
+        if self._msg is None:
+            object.__setattr__(self, "_msg", self._message())
+
+        return self._msg
+
+    @msg.setter
+    def msg(self, msg):
+        object.__setattr__(self, "_msg", msg)
+
+    def _message(self):
+        """
+        Return the message describing the specification, which descendants add to or replace
+        """
+
+        msg = "Must be type {}".format(str(self.type)[8:-2])
+        if self.extra_values:
+            msg += " or one of the following: " + ", ".join(["'{}'".format(value) for value in self.extra_values])
+
+        return msg
+
+    def _changing(self):
+        # changing any part of the specification makes its compiled validator out of date, along with those of any records it is a field of
+        # the private attributes are read with defaults as descendants may set attributes before calling 'Spec.__init__'
+        global _spec_changes
+        if getattr(self, "_frozen", False):
+            raise AttributeError("shared specifications can't be changed")
+        if getattr(self, "_validator", None) is not None:
+            _spec_changes += 1
+            object.__setattr__(self, "_validator", None)
+
+    def __setattr__(self, name, value):
+        self._changing()
+        object.__setattr__(self, name, value)
+
+    def _own(self):
+        # lists and dictionaries are copied when the specification is compiled or shared rather than when they are given, which keeps making it quick,
+        # so changing them in place afterwards is noticed and changing those given doesn't change the specification
+        names = [name for cls in type(self).__mro__ for name in getattr(cls, "__slots__", ()) if not name.startswith("_")]
+        for name in names + list(getattr(self, "__dict__", ())):
+            value = getattr(self, name, None)
+            if isinstance(value, (list, dict)) and getattr(value, "_owner", None) is not self:
+                value = _SpecList(value) if isinstance(value, list) else _SpecDict(value)
+                value._owner = self
+                object.__setattr__(self, name, value)
+
+    def __getstate__(self):
+        # the compiled validator, the cache of its results and the order it checks in can't be pickled and are quick to build again
+        state = getattr(self, "__dict__", {}).copy()
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if name not in ("_validator", "_cache", "_order") and hasattr(self, name):
+                    state[name] = getattr(self, name)
+
+        return state
+
+    def __setstate__(self, state):
+        object.__setattr__(self, "_validator", None)
+        object.__setattr__(self, "_cache", None)
+        object.__setattr__(self, "_cache_size", 0)
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
 
     def __repr__(self):
         return "Spec({})".format(self.msg)
 
+    def compile(self):
+        """
+        Return a function which validates a value according to this specification, built once and reused until the specification is changed
+
+        :return: A function taking a value and returning the same as 'is_valid' would with this specification
+        """
+
+        if getattr(self, "_validator", None) is None:
+            self._own()
+            validator = compile_spec(self)
+            if getattr(self, "_cache_size", 0):
+                validator = _cache_results(self, validator)
+            object.__setattr__(self, "_validator", validator)
+
+        return self._validator
+
+    def cache_results(self, max_size=1024):
+        """
+        Remember the results of validating up to 'max_size' values with this specification, forgetting the least recently used first,
+        so validating a value again is a lookup. Only strings and integers are remembered, as other values such as 0.0 and -0.0 can be equal without being valid in the same way.
+        Only shared specifications can do this as they can't be changed, so the results can't go out of date. The results are forgotten if this is called again,
+        and for a 'SpecAll', 'SpecAny' or 'SpecNot' whenever a specification is changed, as those it combines can be
+
+        :param max_size: The most results to remember. 0 stops remembering results. Default: 1024
+        :return: The specification
+        """
+
+        assert getattr(self, "_frozen", False), "only shared specifications can cache results"
+        assert not isinstance(self, SpecRecord), "records can't cache results"
+        assert isinstance(max_size, int) and max_size >= 0, "param max_size must be a positive integer or 0"
+
+        object.__setattr__(self, "_cache_size", max_size)
+        object.__setattr__(self, "_cache", None)
+        object.__setattr__(self, "_validator", None)
+
+        return self
+
+    def cache_info(self):
+        """
+        Return the number of times validating with this specification found the result remembered and didn't, the most results it remembers and how many it does.
+        Only strings and integers are counted
+
+        :return: A named tuple of 'hits', 'misses', 'maxsize' and 'currsize', or None if this specification doesn't cache results
+        """
+
+        if not getattr(self, "_cache_size", 0):
+            return None
+
+        self.compile()
+
+        return self._cache.cache_info()
+
 class SpecStr(Spec):
     """
     Specifies the format of a string
@@ -55,6 +347,8 @@ class SpecStr(Spec):
     :param extra_values: A list of extra values it can take to always be true, even if not the datatype. Default: None
     """
 
+    __slots__ = ("allowed_strings", "allowed_chars", "to_lower", "_shown_strings", "_shown_chars")
+
     def __init__(self, allowed_strings=None, allowed_chars=None, to_lower=True, extra_values=None):
         """
         Specifies the format of a string
@@ -74,23 +368,76 @@ class SpecStr(Spec):
             assert all([isinstance(item, str) and len(item) == 1 for item in allowed_chars]), "all items in param allowed_chars must be strings of length 1"
 
         super().__init__(str, extra_values)
-        self.allowed_strings = [item.lower() for item in allowed_strings] if to_lower and allowed_strings is not None else allowed_strings
-        self.allowed_chars = [item.lower() for item in allowed_chars] if to_lower and allowed_chars is not None else allowed_chars
-        self.to_lower = to_lower
-
-        if allowed_strings is not None:
-            if to_lower:
-                self.msg += " and once converted to lower case, must be one of the following: "
+        object.__setattr__(self, "allowed_strings", allowed_strings)
+        object.__setattr__(self, "allowed_chars", allowed_chars)
+        object.__setattr__(self, "to_lower", to_lower)
+
+        # the message shows them as they were given rather than lowered, which is only kept when lowering changes them
+        if to_lower and allowed_strings is not None:
+            lowered = [item.lower() for item in allowed_strings]
+            if lowered != allowed_strings:
+                object.__setattr__(self, "allowed_strings", lowered)
+                object.__setattr__(self, "_shown_strings", tuple(allowed_strings))
+        if to_lower and allowed_chars is not None:
+            lowered = [item.lower() for item in allowed_chars]
+            if lowered != allowed_chars:
+                object.__setattr__(self, "allowed_chars", lowered)
+                object.__setattr__(self, "_shown_chars", tuple(allowed_chars))
+
+    def _message(self):
+        msg = super()._message()
+
+        if self.allowed_strings is not None:
+            if self.to_lower:
+                msg += " and once converted to lower case, must be one of the following: "
             else:
-                self.msg += " and must be one of the following: "
-            self.msg += ", ".join(["'{}'".format(item) for item in allowed_strings])
+                msg += " and must be one of the following: "
+            msg += ", ".join(["'{}'".format(item) for item in getattr(self, "_shown_strings", self.allowed_strings)])
 
-        if allowed_chars is not None:
-            if to_lower:
-                self.msg += " and once converted to lower case, every character must be one of the following: "
+        if self.allowed_chars is not None:
+            if self.to_lower:
+                msg += " and once converted to lower case, every character must be one of the following: "
             else:
-                self.msg += " and every character must be one of the following: "
-            self.msg += ", ".join(["'{}'".format(item) for item in allowed_chars])
+                msg += " and every character must be one of the following: "
+            msg += ", ".join(["'{}'".format(item) for item in getattr(self, "_shown_chars", self.allowed_chars)])
+
+        return msg
+
+class SpecStrFile(SpecStr):
+    """
+    Specifies the format of a string which must be one of the lines of a file, for when there are too many allowed strings to keep in a list.
+    The file is only opened when the specification is first used and is searched rather than read, so it can be larger than memory
+
+    :param path: The path of a file of the allowed strings, one per line in UTF-8 and sorted, as made by 'write_vocabulary'. If to_lower is True, they must be lower case
+    :param to_lower: Whether or not to lower the string before checking. Default: True
+    :param extra_values: A list of extra values it can take to always be true, even if not the datatype. Default: None
+    """
+
+    __slots__ = ("path",)
+
+    def __init__(self, path, to_lower=True, extra_values=None):
+        """
+        Specifies the format of a string which must be one of the lines of a file
+
+        :param path: The path of a file of the allowed strings, one per line in UTF-8 and sorted, as made by 'write_vocabulary'. If to_lower is True, they must be lower case
+        :param to_lower: Whether or not to lower the string before checking. Default: True
+        :param extra_values: A list of extra values it can take to always be true, even if not the datatype. Default: None
+        """
+
+        assert isinstance(path, (str, os.PathLike)), "param path must be a string or path"
+
+        super().__init__(None, None, to_lower, extra_values)
+        object.__setattr__(self, "path", path)
+
+    def _message(self):
+        msg = super()._message()
+
+        if self.to_lower:
+            msg += " and once converted to lower case, must be one of the lines of '{}'".format(os.fspath(self.path))
+        else:
+            msg += " and must be one of the lines of '{}'".format(os.fspath(self.path))
+
+        return msg
 
 class SpecNum(Spec):
     """
@@ -101,6 +448,8 @@ class SpecNum(Spec):
     :param extra_values: A list of extra values it can take to always be true, even if not the datatype. Default: None
     """
 
+    __slots__ = ("round_digits",)
+
     def __init__(self, round_digits=None, restrict_to_int=False, extra_values=None):
         """
         Specifies the format of a number
@@ -113,18 +462,21 @@ class SpecNum(Spec):
         assert round_digits is None or isinstance(round_digits, int), "param round_digits must be an integer or None"
 
         super().__init__(int if restrict_to_int else float, extra_values)
-        self.round_digits = round_digits
+        object.__setattr__(self, "round_digits", round_digits)
 
-        if restrict_to_int:
-            self.msg = "Must be an integer"
+    def _message(self):
+        if self.type is int:
+            msg = "Must be an integer"
         else:
-            self.msg = "Must be a number"
+            msg = "Must be a number"
+
+        if self.round_digits is not None:
+            msg = "Once rounded to {} decimal places, m".format(self.round_digits) + msg[1:]
 
-        if round_digits is not None:
-            self.msg = "Once rounded to {} decimal places, m".format(round_digits) + self.msg[1:]
+        if self.extra_values:
+            msg += " or leave blank"
 
-        if extra_values:
-            self.msg += " or leave blank"
+        return msg
 
 class SpecNumRange(SpecNum):
     """
@@ -137,6 +489,8 @@ class SpecNumRange(SpecNum):
     :param extra_values: A list of extra values it can take to always be true, even if not the datatype. Default: None
     """
 
+    __slots__ = ("min", "max")
+
     def __init__(self, min_=None, max_=None, round_digits=None, restrict_to_int=False, extra_values=None):
         """
         Specifies the format of a number in a range
@@ -152,13 +506,18 @@ class SpecNumRange(SpecNum):
         assert isinstance(max_, (int, float)) or max_ is None, "param max_ must be a number or None"
 
         super().__init__(round_digits, restrict_to_int, extra_values)
-        self.min = min_
-        self.max = max_
+        object.__setattr__(self, "min", min_)
+        object.__setattr__(self, "max", max_)
 
-        if min_ is not None:
-            self.msg += ", minimum {}".format(min_)
-        if max_ is not None:
-            self.msg += ", maximum {}".format(max_)
+    def _message(self):
+        msg = super()._message()
+
+        if self.min is not None:
+            msg += ", minimum {}".format(self.min)
+        if self.max is not None:
+            msg += ", maximum {}".format(self.max)
+
+        return msg
 
 class SpecNumList(SpecNum):
     """
@@ -170,6 +529,8 @@ class SpecNumList(SpecNum):
     :param extra_values: A list of extra values it can take to always be true, even if not the datatype. Default: None
     """
 
+    __slots__ = ("list_of_allowed",)
+
     def __init__(self, list_of_allowed, round_digits=None, restrict_to_int=False, extra_values=None):
         """
         Specifies the format of a number from a list of allowed numbers
@@ -184,281 +545,2665 @@ class SpecNumList(SpecNum):
         assert all([isinstance(item, int if restrict_to_int else (int, float)) for item in list_of_allowed]), "all items in param list_of_allowed must be numbers"
 
         super().__init__(round_digits, restrict_to_int, extra_values)
-        self.list_of_allowed = list_of_allowed
+        object.__setattr__(self, "list_of_allowed", list_of_allowed)
 
-        self.msg += " that is one of the following: " + ", ".join(["'{}'".format(item) for item in list_of_allowed])
+    def _message(self):
+        return super()._message() + " that is one of the following: " + ", ".join(["'{}'".format(item) for item in self.list_of_allowed])
 
-def is_valid(value, spec):
+class SpecRecord(Spec):
     """
-    Return whether or not 'value' is valid according to 'spec' and the validated 'value'
+    Specifies the format of a record, such as a dictionary or tuple, where each field has its own specification
 
-    :param value: The value to validate
-    :param spec: A descendant of the 'Spec' class, containing information on how to validate
-    :return: Whether or not the value was valid according to the specification
-    :return: The value after validation (converted to the right type, lowered if applicable, etc.). This is only valid if the first return value is True.
+    :param fields: A dictionary of field names to a descendant of the 'Spec' class to validate that field with, which can be another 'SpecRecord'. Tuples and lists have their values matched to the fields in this order
+    :param optional: A list of the names of fields which can be missing. None means all are required. Default: None
+    :param extra_values: A list of extra values it can take to always be true, even if not a record. Default: None
     """
 
-    assert isinstance(spec, Spec), "param spec must be an object of a 'Spec' class"
-
-    if spec.extra_values and value in spec.extra_values:
-        return True, value
+    __slots__ = ("fields", "optional")
 
-    if isinstance(value, str):
-        value = value.strip()
-
-    if isinstance(spec, SpecNum):
-        # rounds before converting as if it is meant to be an int but it is a float but they have
-        # allowed rounding to the nearest whole number, it would error but not when doing this
-        try:
-            value = float(value)
-        except (ValueError, TypeError):
-            return False, value
-        else:
-            if spec.round_digits is not None:
-                value = _round(value, spec.round_digits)
+    def __init__(self, fields, optional=None, extra_values=None):
+        """
+        Specifies the format of a record, such as a dictionary or tuple, where each field has its own specification
 
-    try:
-        value = spec.type(value)
-    except ValueError:
-        return False, value
-    else:
-        if isinstance(spec, SpecStr) and spec.to_lower:
-            value = value.lower()
-        if isinstance(spec, SpecNum) and spec.round_digits is not None:
-            value = _round(value, spec.round_digits)
+        :param fields: A dictionary of field names to a descendant of the 'Spec' class to validate that field with, which can be another 'SpecRecord'. Tuples and lists have their values matched to the fields in this order
+        :param optional: A list of the names of fields which can be missing. None means all are required. Default: None
+        :param extra_values: A list of extra values it can take to always be true, even if not a record. Default: None
+        """
 
-        if hasattr(spec, "allowed_strings") and spec.allowed_strings is not None:
-            return value in spec.allowed_strings, value
+        assert isinstance(fields, dict), "param fields must be a dictionary"
+        assert all([isinstance(spec, Spec) for spec in fields.values()]), "all values in param fields must be objects of a 'Spec' class"
 
-        if hasattr(spec, "list_of_allowed") and spec.list_of_allowed is not None:
-            return value in spec.list_of_allowed, value
+        assert isinstance(optional, list) or optional is None, "param optional must be a list or None"
+        if optional is not None:
+            assert all([name in fields for name in optional]), "all items in param optional must be names of fields"
 
-        if hasattr(spec, "allowed_chars") and spec.allowed_chars is not None:
-            return all([char in spec.allowed_chars for char in value]), value
+        super().__init__(dict, extra_values)
+        object.__setattr__(self, "fields", fields)
+        object.__setattr__(self, "optional", optional)
 
-        if isinstance(spec, SpecNumRange):
-            if spec.min is not None and spec.max is not None:
-                return spec.min <= value <= spec.max, value
-            if spec.min is not None:
-                return spec.min <= value, value
-            if spec.max is not None:
-                return value <= spec.max, value
+    def _message(self):
+        msg = "Must be a record with the following fields: " + ", ".join(["'{}'{}".format(name, " (optional)" if self.optional is not None and name in self.optional else "") for name in self.fields])
+        if self.extra_values:
+            msg += " or one of the following: " + ", ".join(["'{}'".format(value) for value in self.extra_values])
 
-    return True, value
+        return msg
 
-def validate_input(spec, prompt=None):
+class _SpecCombination(Spec):
     """
-    Repeatedly ask the user for input until their input is valid according to 'spec' and return their validated input
+    Private class which specifies the format of data by combining other specifications, checking them in the order which has been quickest so far
 
-    :param spec: A descendant of the 'Spec' class, containing information on how to validate
-    :param prompt: The prompt to display to the user before asking them to input. None displays nothing. Default: None
-    :return: The valid value the user input
+    :param specs: A list of descendants of the 'Spec' class to combine
+    :param extra_values: A list of extra values it can take to always be true. Default: None
     """
 
-    acceptable = False
-    while not acceptable:
-        acceptable, value = is_valid(input(prompt) if prompt is not None else input(), spec)
-        if not acceptable:
-            print(spec.msg)
+    __slots__ = ("specs", "_order")
 
-    return value
+    def __init__(self, specs, extra_values=None):
+        assert isinstance(specs, list) and specs, "param specs must be a list which isn't empty"
+        assert all([isinstance(spec, Spec) for spec in specs]), "all items in param specs must be objects of a 'Spec' class"
 
-def assert_valid(value, spec, name=None):
-    """
-    Throw an assertion error if 'value' is invalid according to 'spec', otherwise return it
+        object.__setattr__(self, "_order", None)
+        super().__init__(object, extra_values)
+        object.__setattr__(self, "specs", specs)
 
-    :param value: The value to validate
-    :param spec: A descendant of the 'Spec' class, containing information on how to validate
-    :param name: The name to reference the value so it is clear what is invalid in error messages. None just displays the error message. Default: None
-    :return value: If it hasn't thrown an assertion error, returns the valid value after normalisation
-    """
+    def __setstate__(self, state):
+        object.__setattr__(self, "_order", None)
+        super().__setstate__(state)
 
-    valid, value = is_valid(value, spec)
+    def _message(self):
+        msg = self._joined + "; ".join([spec.msg for spec in self.specs])
+        if self.extra_values:
+            msg += " or one of the following: " + ", ".join(["'{}'".format(value) for value in self.extra_values])
 
-    assert valid, spec.msg if name is None else str(name).strip().lower() + ": " + spec.msg
+        return msg
 
-    return value
+    def ordering_stats(self):
+        """
+        Return what has been recorded about checking each specification, which decides the order they are checked in.
+        Only some checks are recorded, so the numbers are a sample of them
 
-def true_false(prompt=None, extra_values=None):
+        :return: A dictionary of 'order', a list of the positions of the specifications in the order they are checked,
+            and 'specs', a list of a dictionary for each specification of its 'spec' as a string, the number of times it was 'checked',
+            the number of times it 'passed' and the 'seconds' it took altogether
+        """
+
+        self.compile()
+        order = self._order
+
+        return {
+            "order": list(order.order),
+            "specs": [{"spec": repr(spec), "checked": order.checked[index], "passed": order.passed[index], "seconds": order.seconds[index]} for index, spec in enumerate(self.specs)],
+        }
+
+class SpecAll(_SpecCombination):
     """
-    Repeatedly ask the user for an input until they input a boolean-like value and return the boolean version
+    Specifies the format of data which must be valid according to every one of a list of specifications.
+    The validated data is as validated by the first specification, and invalid data is left as it is.
+    Specifications are checked in the order found quickest, and one which raises an exception for the data counts as not valid so the result doesn't depend on the order
 
-    :param prompt: The prompt to display to the user before asking them to input. None will not display anything. Default: None
-    :param extra_values: A list of extra values it can take to be None. Default: None
-    :return: True or False depending on the user's input or None if extra_values and they input one of these
+    :param specs: A list of descendants of the 'Spec' class which the data must be valid according to
+    :param extra_values: A list of extra values it can take to always be true. Default: None
     """
 
-    value = validate_input(specTrueFalse, prompt)
+    __slots__ = ()
+    _joined = "Must meet all of the following: "
 
-    if extra_values is not None and value in extra_values:
-        return None
+    def __init__(self, specs, extra_values=None):
+        """
+        Specifies the format of data which must be valid according to every one of a list of specifications
 
-    if value in ["f", "false", "n", "no", "0", "off", "disabled", "disable"]:
-        return False
+        :param specs: A list of descendants of the 'Spec' class which the data must be valid according to
+        :param extra_values: A list of extra values it can take to always be true. Default: None
+        """
 
-    return True
+        super().__init__(specs, extra_values)
 
-def date(prompt=None, enforce=True, form="exact", fill_0s=True):
+class SpecAny(_SpecCombination):
     """
-    Repeatedly ask the user for a year, month and day until they input valid values and return this in a defined format
+    Specifies the format of data which must be valid according to at least one of a list of specifications.
+    The validated data is as validated by the first specification in the list it is valid according to, and invalid data is left as it is.
+    Specifications are checked in the order found quickest, and one which raises an exception for the data counts as not valid so the result doesn't depend on the order
 
-    :param prompt: Message to display to the user before asking them for inputs. Default: None
-    :param enforce: Whether or not to enforce valid dates. If False, will allow empty inputs. Default: True
-    :param form: The form to output the date in. Default: 'exact'. Must be one of the following:
-        - 'exact': year-month-day
-        - 'uk': day/month/year
-        - 'us': month/day/year
-        - 'long': day_with_suffix month_as_word, year
-    :param fill_0s: Whether or not to fill numerical dates with leading 0s. Doesn't apply to 'long' form
+    :param specs: A list of descendants of the 'Spec' class which the data must be valid according to one of
+    :param extra_values: A list of extra values it can take to always be true. Default: None
     """
 
-    extras = None if enforce else [""]
-
-    form = assert_valid(form, SpecStr(["exact", "uk", "us", "long"]), "param form")
+    __slots__ = ()
+    _joined = "Must meet at least one of the following: "
 
-    if prompt is not None:
-        print(prompt, "\n")
+    def __init__(self, specs, extra_values=None):
+        """
+        Specifies the format of data which must be valid according to at least one of a list of specifications
 
-    year = validate_input(SpecNumRange(restrict_to_int=True, extra_values=extras), "Year: " if enforce else "Year (can leave blank): ")
+        :param specs: A list of descendants of the 'Spec' class which the data must be valid according to one of
+        :param extra_values: A list of extra values it can take to always be true. Default: None
+        """
 
-    if enforce:
-        if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
-            leap_year = True
-        else:
-            leap_year = False
+        super().__init__(specs, extra_values)
 
-    months = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
-    allowed = months.copy()
-    allowed.extend(["1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12"])
+class SpecNot(Spec):
+    """
+    Specifies the format of data which mustn't be valid according to a specification. The data is left as it is
 
-    month = validate_input(SpecStr(allowed, extra_values=extras), "Month: " if enforce else "Month (can leave blank): ")
-    if month in months:
-        month = months.index(month) + 1
-    elif month in allowed:
-        month = int(month)
+    :param spec: A descendant of the 'Spec' class which the data mustn't be valid according to
+    :param extra_values: A list of extra values it can take to always be true. Default: None
+    """
 
-    days = 28 if month == 2 and (not enforce or not leap_year) else \
-        29 if month == 2 and (not enforce or leap_year) else \
-        30 if month == 4 or month == 6 or month == 9 or month == 11 else \
-        31
+    __slots__ = ("spec",)
 
-    day = validate_input(SpecNumRange(1, days, None, True, extras), "Date/day: " if enforce else "Date/day (can leave blank): ")
+    def __init__(self, spec, extra_values=None):
+        """
+        Specifies the format of data which mustn't be valid according to a specification
 
-    if year is None:
-        year = "?"
+        :param spec: A descendant of the 'Spec' class which the data mustn't be valid according to
+        :param extra_values: A list of extra values it can take to always be true. Default: None
+        """
 
-    if month is None:
-        month = "?"
+        assert isinstance(spec, Spec), "param spec must be an object of a 'Spec' class"
 
-    if day is None:
-        day = "?"
+        super().__init__(object, extra_values)
+        object.__setattr__(self, "spec", spec)
 
-    if form == "long":
+    def _message(self):
+        msg = "Must not meet the following: " + self.spec.msg
+        if self.extra_values:
+            msg += " or be one of the following: " + ", ".join(["'{}'".format(value) for value in self.extra_values])
 
-        suffix = "st" if day % 10 == 1 else "nd" if day % 10 == 2 else "rd" if day % 10 == 3 else "th"
-        month = months[month - 1]
-        month = "".join([month[i].upper() if i == 0 else month[i] for i in range(len(month))])
+        return msg
 
-        return "{}{} {}, {}".format(day, suffix, month, year)
+def _shared_key(values):
+    """
+    Private method which returns a hashable key of the parameters of a specification for 'Spec.shared', including the datatypes so 1 and 1.0 aren't the same
+    Raises a TypeError if any parameter can't be hashed
+    """
 
-    if fill_0s and month != "?" and day != "?":
-        if month < 10:
-            month = "0" + str(month)
-        if day < 10:
-            day = "0" + str(day)
+    key = []
+    for value in values:
+        if type(value) is list or type(value) is tuple:
+            key.append((type(value), tuple(value), tuple(map(type, value))))
+        elif type(value) is dict:
+            key.append((dict, tuple(value), _shared_key(value.values())))
+        else:
+            key.append((type(value), value))
 
-    if form == "exact":
-        return "{}-{}-{}".format(year, month, day)
+    return tuple(key)
 
-    if form == "us":
-        return "{}/{}/{}".format(month, day, year)
+def _membership(allowed):
+    """
+    Private method which returns a function checking whether a value is in 'allowed' using a hash lookup rather than searching the list
+    Falls back to searching the list if any of 'allowed' can't be hashed
+    """
 
-    return "{}/{}/{}".format(day, month, year)
+    try:
+        return frozenset(allowed).__contains__
+    except TypeError:
+        return allowed.__contains__
 
-def time(prompt=None, output_hour_clock=24, milli_seconds=False, fill_0s=True, allow_na=False):
+def _sorted_file(path):
+    """
+    Private method which returns a function checking whether a string is one of the lines of the sorted file at 'path' and a function returning up to a number of
+    the lines starting with a string in order, both binary searching it and reading only the lines they compare with rather than the whole file
     """
-    Repeatedly ask the user to input hours, minutes and seconds until they input valid values and return this in a defined format
 
-    :param prompt: Message to display to the user before asking them for inputs. Default: None
-    :param output_hour_clock: Whether to output in 24 hour clock or in 12 hour clock with AM/PM. Default: 24
-    :param milli_seconds: Whether or not to allow more accuracy in seconds. Default: False
-    :param fill_0s: Whether or not to fill numerical times with leading 0s. Default: False
-    :param allow_na: Whether or not to allow empty inputs too. Default: False
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            lines = b""
+        else:
+            lines = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    size = len(lines)
+    find = lines.find
+    rfind = lines.rfind
+    # the first comparisons are the same for every search so the lines they compare with are kept, up to 4095 of them
+    kept = {}
+
+    def line_around(position):
+        start = rfind(b"\n", 0, position) + 1
+        end = find(b"\n", start)
+        if end == -1:
+            end = size
+        return start, end, lines[start:end]
+
+    def search(value, stop_if_found):
+        # returns the start of the first line which isn't before value, UTF-8 sorting in the same order as the strings it encodes
+        low = 0
+        high = size
+        depth = 0
+        while low < high:
+            # compares with the line around the middle of what is left
+            middle = (low + high) // 2
+            if depth < 12:
+                depth += 1
+                found = kept.get(middle)
+                if found is None:
+                    found = kept[middle] = line_around(middle)
+            else:
+                found = line_around(middle)
+            start, end, line = found
+            if line < value:
+                low = end + 1
+            elif line > value or not stop_if_found:
+                high = start
+            else:
+                return start
+        return low
+
+    def contains(value):
+        if "\n" in value:
+            return False
+        value = value.encode("utf-8", "surrogatepass")
+        start = search(value, True)
+        return start < size and lines[start:start + len(value) + 1] in (value, value + b"\n")
+
+    def starting_with(value, limit):
+        if "\n" in value:
+            return []
+        value = value.encode("utf-8", "surrogatepass")
+        start = search(value, False)
+        found = []
+        while start < size and len(found) < limit:
+            end = find(b"\n", start)
+            if end == -1:
+                end = size
+            line = lines[start:end]
+            if not line.startswith(value):
+                break
+            found.append(line.decode("utf-8", "surrogatepass"))
+            start = end + 1
+        return found
+
+    return contains, starting_with
+
+def _only_chars(allowed_chars):
+    """
+    Private method which returns a function checking whether every character of a string is in 'allowed_chars' in a single pass
     """
 
-    extras = None if allow_na else [""]
+    # lowering some characters makes more than one, which no single character is equal to
+    allowed_chars = [char for char in allowed_chars if len(char) == 1]
+    if not allowed_chars:
+        pattern = re.compile("")
+    else:
+        pattern = re.compile("[{}]*".format("".join([re.escape(char) for char in sorted(set(allowed_chars))])))
 
-    output_hour_clock = assert_valid(output_hour_clock, SpecNumList([12, 24], None, True), "param output_hour_clock")
+    match = pattern.fullmatch
 
-    if prompt is not None:
-        print(prompt, "\n")
+    return lambda value: match(value) is not None
 
-    input_hour_clock = validate_input(SpecNumList([12, 24], None, True), "Input hour clock (12/24): ")
+def _compile_check(spec):
+    """
+    Private method which returns the final check of 'is_valid' for 'spec' on a value that has already been converted, or None if there is nothing to check
+    """
 
-    if input_hour_clock == 12:
-        hours = validate_input(SpecNumRange(1, 12, None, True, extras), "Hours (12 hour clock): ")
-        period = validate_input(SpecStr(["am", "pm"], extra_values=extras), "AM or PM? ")
-        if hours == 12:
-            hours = 0
-        if period == "pm":
-            hours += 12
-    else:
-        hours = validate_input(SpecNumRange(0, 23, None, True, extras), "Hours (24 hour clock): ")
+    if getattr(spec, "allowed_strings", None) is not None:
+        return _membership(spec.allowed_strings)
 
-    minutes = validate_input(SpecNumRange(0, 59, None, True, extras), "Minutes: ")
+    if isinstance(spec, SpecStrFile):
+        return _sorted_file(spec.path)[0]
 
-    if milli_seconds:
-        seconds = validate_input(SpecNumRange(0, 59.999999, 6, False, extras), "Seconds including decimal: ")
-    else:
-        seconds = validate_input(SpecNumRange(0, 59, 0, True, extras), "Seconds: ")
+    if getattr(spec, "list_of_allowed", None) is not None:
+        return _membership(spec.list_of_allowed)
 
-    if hours is not None and output_hour_clock == 12:
-        if hours < 12:
-            period = "AM"
-        else:
-            period = "PM"
+    if getattr(spec, "allowed_chars", None) is not None:
+        return _only_chars(spec.allowed_chars)
 
-        hours %= 12
-        if hours == 0:
-            hours = 12
+    if isinstance(spec, SpecNumRange):
+        min_ = spec.min
+        max_ = spec.max
+        if min_ is not None and max_ is not None:
+            # integers in a finite range can be looked up in a range object without calling back into python
+            if spec.type is int and math.isfinite(min_) and math.isfinite(max_):
+                return range(math.ceil(min_), math.floor(max_) + 1).__contains__
+            return lambda value: min_ <= value <= max_
+        if min_ is not None:
+            return functools.partial(operator.le, min_)
+        if max_ is not None:
+            return functools.partial(operator.ge, max_)
 
-    if fill_0s:
-        if hours is not None and hours < 10:
-            hours = "0" + str(hours)
-        if minutes is not None and minutes < 10:
-            minutes = "0" + str(minutes)
-        if seconds is not None and seconds < 10:
-            seconds = "0" + str(seconds)
+    return None
 
-    to_return = "{}:{}:{}".format(hours, minutes, seconds)
+def _compile_num(spec, check):
+    """
+    Private method which returns a validator for a 'SpecNum' with only the conversions and rounding that apply to it
+    """
 
-    if output_hour_clock == 12:
-        to_return += " {}".format(period)
+    type_ = spec.type
+    digits = spec.round_digits
+
+    if digits is None:
+        if type_ is float:
+            if check is None:
+                def validator(value):
+                    try:
+                        value = float(value)
+                    except (ValueError, TypeError):
+                        return False, value.strip() if isinstance(value, str) else value
+                    return True, value
+            else:
+                def validator(value):
+                    try:
+                        value = float(value)
+                    except (ValueError, TypeError):
+                        return False, value.strip() if isinstance(value, str) else value
+                    return check(value), value
+        else:
+            if check is None:
+                def validator(value):
+                    try:
+                        value = float(value)
+                    except (ValueError, TypeError):
+                        return False, value.strip() if isinstance(value, str) else value
+                    try:
+                        value = type_(value)
+                    except ValueError:
+                        return False, value
+                    return True, value
+            else:
+                def validator(value):
+                    try:
+                        value = float(value)
+                    except (ValueError, TypeError):
+                        return False, value.strip() if isinstance(value, str) else value
+                    try:
+                        value = type_(value)
+                    except ValueError:
+                        return False, value
+                    return check(value), value
+        # lets records check values of this specification without calling the validator
+        validator._check = check
+        return validator
+
+    round_ = round if digits == 0 else functools.partial(round, ndigits=digits)
+    # rounding an integer to a non-negative number of digits never changes it so it only needs doing again for other types or negative digits
+    round_again = type_ is not int or digits < 0
+
+    def validator(value):
+        try:
+            value = float(value)
+        except (ValueError, TypeError):
+            return False, value.strip() if isinstance(value, str) else value
+        value = round_(value)
+        try:
+            value = type_(value)
+        except ValueError:
+            return False, value
+        if round_again:
+            value = round_(value)
+        return (True if check is None else check(value)), value
 
-    return to_return
+    return validator
 
-def datetime(prompt=None, enforce=True, form="exact", milli_seconds=False, fill_0s=True):
+def _compile_str(spec, check):
+    """
+    Private method which returns a validator for a 'SpecStr', only lowering the string if the specification says to
     """
-    Repeatedly ask the user to input a year, month, day, hours, minutes and seconds until they input valid values and return this in a defined format
+
+    if spec.to_lower:
+        if check is None:
+            def validator(value):
+                if isinstance(value, str):
+                    return True, value.strip().lower()
+                try:
+                    return True, str(value).lower()
+                except ValueError:
+                    return False, value
+        else:
+            def validator(value):
+                if isinstance(value, str):
+                    value = value.strip().lower()
+                else:
+                    try:
+                        value = str(value).lower()
+                    except ValueError:
+                        return False, value
+                return check(value), value
+    else:
+        if check is None:
+            def validator(value):
+                if isinstance(value, str):
+                    return True, value.strip()
+                try:
+                    return True, str(value)
+                except ValueError:
+                    return False, value
+        else:
+            def validator(value):
+                if isinstance(value, str):
+                    value = value.strip()
+                else:
+                    try:
+                        value = str(value)
+                    except ValueError:
+                        return False, value
+                return check(value), value
+
+    # lets records check strings of this specification without calling the validator
+    validator._check = check
+
+    return validator
+
+def _compile_type(spec, check):
+    """
+    Private method which returns a validator for any other 'Spec', converting to its datatype
+    """
+
+    type_ = spec.type
+
+    def validator(value):
+        if isinstance(value, str):
+            value = value.strip()
+        try:
+            value = type_(value)
+        except ValueError:
+            return False, value
+        return (True if check is None else check(value)), value
+
+    return validator
+
+def _record_as_dict(record, spec):
+    """
+    Private method which returns 'record' as a dictionary of the fields of 'spec', a 'SpecRecord', or None if it can't be
+    """
+
+    if isinstance(record, dict):
+        return record
+
+    if isinstance(record, (tuple, list)) and len(record) <= len(spec.fields):
+        return dict(zip(spec.fields, record))
+
+    return None
+
+def _record_as_type(validated, record, spec):
+    """
+    Private method which returns 'validated', a dictionary of fields, as the same type as 'record' was originally
+    """
+
+    if isinstance(record, dict):
+        return validated
+
+    values = [validated[name] for name in spec.fields if name in validated]
+
+    if hasattr(record, "_make"):
+        return record._make(values)
+
+    return type(record)(values)
+
+def _inline_field(field, validator):
+    """
+    Private method which returns how a record can validate the values of 'field' itself rather than calling its 'validator':
+    a function looking up the validated value of the valid values which are already as they would be validated, or None,
+    and the conversion, which is 1 to strip strings, 2 to strip and lower them, 3 to convert to a float or 4 to convert to an integer, or 0 if there is none, with the check the converted value must pass
+    """
+
+    check = getattr(validator, "_check", _MISSING)
+    if check is _MISSING:
+        return None, 0, None
+
+    if isinstance(field, SpecStr):
+        candidates = None
+        if field.allowed_strings is not None and not isinstance(field, SpecStrFile):
+            candidates = [item for item in field.allowed_strings if isinstance(item, str)]
+        conversion = 2 if field.to_lower else 1
+    elif field.type is int and field.round_digits is None:
+        candidates = field.list_of_allowed if isinstance(field, SpecNumList) else None
+        if isinstance(field, SpecNumRange) and field.min is not None and field.max is not None and -math.inf < field.min <= field.max < math.inf:
+            candidates = range(math.ceil(field.min), math.floor(field.max) + 1)
+        if candidates is not None and len(candidates) <= _MAX_KNOWN // 2:
+            candidates = [number for number in candidates if isinstance(number, int)]
+            candidates += [str(number) for number in candidates]
+        else:
+            candidates = None
+        conversion = 4
+    else:
+        candidates = None
+        conversion = 3 if field.type is float and field.round_digits is None else 0
+
+    known = None
+    if candidates is not None and len(candidates) <= _MAX_KNOWN:
+        # values equal to a string or an integer are validated the same by these specifications, so the validator's result for each valid one can be looked up
+        known = {}
+        for candidate in candidates:
+            valid, validated = validator(candidate)
+            if valid:
+                known[candidate] = validated
+        known = known.get
+
+    return known, conversion, check
+
+def _compile_record(spec):
+    """
+    Private method which returns a validator for a 'SpecRecord'. As well as the value, it takes a dictionary to put the errors of each field in,
+    or None to stop at the first invalid field without finding the error message, and whether or not to stop at the first invalid field.
+    A field whose specification raises an exception is invalid with the exception as its error rather than raising it, unless there is no dictionary of errors
+    """
+
+    extra_values = spec.extra_values
+    optional = spec.optional or ()
+    missing = _MISSING
+    plan = []
+    planned = None
+
+    def validator(value, errors=None, fail_fast=True):
+        nonlocal planned
+
+        if extra_values and value in extra_values:
+            return True, value
+
+        record = _record_as_dict(value, spec)
+        if record is None:
+            if errors is not None:
+                errors[None] = spec.msg
+            return False, value
+
+        # the fields' validators are kept to save looking them up every time but must be looked up again if any specification has changed
+        if planned != _spec_changes:
+            plan[:] = [(name, validator, field, isinstance(field, SpecRecord)) + _inline_field(field, validator) for name, field in spec.fields.items() for validator in [field.compile()]]
+            planned = _spec_changes
+
+        validated = record.copy()
+
+        for name, field_validator, field, is_record, known, inline, check in plan:
+            try:
+                field_value = record[name]
+            except KeyError:
+                if name in optional:
+                    continue
+                if errors is None:
+                    return False, _record_as_type(validated, value, spec)
+                errors[name] = "Missing"
+                if fail_fast:
+                    break
+                continue
+
+            # simple fields are looked up or converted and checked here as calling each field's validator takes most of the time, and anything which may not be valid is left to the validator
+            if known is not None:
+                try:
+                    converted = known(field_value, missing)
+                except TypeError:
+                    converted = missing
+                if converted is not missing:
+                    validated[name] = converted
+                    continue
+            if inline:
+                if inline < 3:
+                    converted = missing
+                    if type(field_value) is str:
+                        converted = field_value.strip().lower() if inline == 2 else field_value.strip()
+                else:
+                    try:
+                        converted = float(field_value) if inline == 3 else int(float(field_value))
+                    except Exception:
+                        converted = missing
+                if converted is not missing and (check is None or check(converted)):
+                    validated[name] = converted
+                    continue
+
+            if errors is None:
+                field_valid, validated[name] = field_validator(field_value)
+                if not field_valid:
+                    return False, _record_as_type(validated, value, spec)
+                continue
+
+            try:
+                if is_record:
+                    field_errors = {}
+                    field_valid, field_value = field_validator(field_value, field_errors, fail_fast)
+                else:
+                    field_valid, field_value = field_validator(field_value)
+            except Exception as error:
+                field_valid = False
+                field_errors = "{}: {}".format(type(error).__name__, error)
+            else:
+                if not is_record:
+                    field_errors = field.msg
+
+            if field_valid:
+                validated[name] = field_value
+            else:
+                errors[name] = field_errors
+                if fail_fast:
+                    break
+
+        if errors is None:
+            return True, _record_as_type(validated, value, spec)
+
+        valid = not errors
+
+        return valid, _record_as_type(validated, value, spec)
+
+    return validator
+
+def _cache_results(spec, validator):
+    """
+    Private method which returns 'validator' remembering its results as set by 'Spec.cache_results'
+    """
+
+    # only strings and integers are remembered, as other values can be equal without being valid in the same way, such as 0.0 and -0.0, (1,) and (1.0,) or True and 1
+    cached = functools.lru_cache(spec._cache_size)(validator)
+    object.__setattr__(spec, "_cache", cached)
+
+    def cached_validator(value):
+        if type(value) is str or type(value) is int:
+            return cached(value)
+        return validator(value)
+
+    if not isinstance(spec, (_SpecCombination, SpecNot)):
+        return cached_validator
+
+    # the specifications combined aren't shared so can be changed, which makes the results remembered out of date
+    changes = _spec_changes
+
+    def combination_validator(value):
+        nonlocal changes
+        if changes != _spec_changes:
+            cached.cache_clear()
+            changes = _spec_changes
+        if type(value) is str or type(value) is int:
+            return cached(value)
+        return validator(value)
+
+    return combination_validator
+
+class _CheckOrder:
+    """
+    Private class which records how often each specification of a 'SpecAll' or 'SpecAny' passed and how long it took, and the order to check them in
+    """
+
+    __slots__ = ("order", "checked", "passed", "seconds")
+
+    def __init__(self, count):
+        self.order = list(range(count))
+        self.checked = [0] * count
+        self.passed = [0] * count
+        self.seconds = [0.0] * count
+
+    def reorder(self, by_passes):
+        # checks the specifications most likely to decide the result for the time they take first, those not timed yet first of all
+        # and those given first when they are the same, so the order is always the same for the same records
+        def score(index):
+            if not self.checked[index]:
+                return math.inf
+            decided = self.passed[index] if by_passes else self.checked[index] - self.passed[index]
+            return (decided + 1) / (self.checked[index] + 2) / (self.seconds[index] / self.checked[index] or 1e-9)
+
+        self.order = sorted(self.order, key=lambda index: (-score(index), index))
+
+def _compile_combination(spec):
+    """
+    Private method which returns a validator for a 'SpecAll' or 'SpecAny', which stops as soon as the result is known and checks in the order in 'spec._order',
+    counting a specification which raises an exception as not valid
+    """
+
+    specs = spec.specs
+    any_ = isinstance(spec, SpecAny)
+    order = _CheckOrder(len(specs))
+    object.__setattr__(spec, "_order", order)
+    checked = order.checked
+    passed = order.passed
+    seconds = order.seconds
+    validators = [field.compile() for field in specs]
+    changes = _spec_changes
+    calls = 0
+
+    def check_all(value, timed):
+        result = None
+        for index in order.order:
+            if timed:
+                start = perf_counter()
+                valid, converted = validators[index](value)
+                seconds[index] += perf_counter() - start
+                checked[index] += 1
+                passed[index] += valid
+            else:
+                valid, converted = validators[index](value)
+            if not valid:
+                return False, value
+            if index == 0:
+                result = converted
+        return True, result
+
+    def check_any(value, timed):
+        # the first specification given which passes decides the result, so once one passes only those given before it are checked
+        first = len(specs)
+        result = value
+        for index in order.order:
+            if index > first:
+                continue
+            if timed:
+                start = perf_counter()
+                valid, converted = validators[index](value)
+                seconds[index] += perf_counter() - start
+                checked[index] += 1
+                passed[index] += valid
+            else:
+                valid, converted = validators[index](value)
+            if valid:
+                first = index
+                result = converted
+                if index == 0:
+                    break
+        return first < len(specs), result
+
+    def check_given(value):
+        # checks in the order given, counting a specification which raises an exception as not valid
+        for index, validator in enumerate(validators):
+            try:
+                valid, converted = validator(value)
+            except Exception:
+                valid = converted = False
+            if valid == any_:
+                return any_, converted if any_ else value
+            if index == 0:
+                result = converted
+        return not any_, value if any_ else result
+
+    check = check_any if any_ else check_all
+
+    def validator(value):
+        nonlocal calls, changes, validators
+        if changes != _spec_changes:
+            # one of the specifications may have been changed
+            validators = [field._validator or field.compile() for field in specs]
+            changes = _spec_changes
+        calls += 1
+        try:
+            if calls % _ORDER_SAMPLE:
+                return check(value, False)
+            if calls % _ORDER_EVERY == 0:
+                order.reorder(any_)
+            return check(value, True)
+        except Exception:
+            # whether a specification which raises is reached depends on the order learned, so it is instead counted as not valid
+            return check_given(value)
+
+    return validator
+
+def _compile_not(spec):
+    """
+    Private method which returns a validator for a 'SpecNot'
+    """
+
+    negated = spec.spec
+
+    def validator(value):
+        return not (negated._validator or negated.compile())(value)[0], value
+
+    return validator
+
+def compile_spec(spec):
+    """
+    Return a function which validates a value according to 'spec', with every check that doesn't apply to 'spec' removed in advance.
+    Changing 'spec' afterwards does not change the returned function, use 'Spec.compile' to get one which is kept up to date
+
+    :param spec: A descendant of the 'Spec' class, containing information on how to validate
+    :return: A function taking a value and returning the same as 'is_valid' would with 'spec'
+    """
+
+    assert isinstance(spec, Spec), "param spec must be an object of a 'Spec' class"
+
+    if isinstance(spec, SpecRecord):
+        return _compile_record(spec)
+
+    if isinstance(spec, _SpecCombination):
+        validator = _compile_combination(spec)
+    elif isinstance(spec, SpecNot):
+        validator = _compile_not(spec)
+    elif isinstance(spec, SpecNum):
+        validator = _compile_num(spec, _compile_check(spec))
+    elif isinstance(spec, SpecStr):
+        validator = _compile_str(spec, _compile_check(spec))
+    else:
+        validator = _compile_type(spec, _compile_check(spec))
+
+    if not spec.extra_values:
+        return validator
+
+    extra_values = spec.extra_values
+    converted = validator
+
+    def validator(value):
+        if value in extra_values:
+            return True, value
+        return converted(value)
+
+    return validator
+
+def is_valid(value, spec):
+    """
+    Return whether or not 'value' is valid according to 'spec' and the validated 'value'
+
+    :param value: The value to validate
+    :param spec: A descendant of the 'Spec' class, containing information on how to validate
+    :return: Whether or not the value was valid according to the specification
+    :return: The value after validation (converted to the right type, lowered if applicable, etc.). This is only valid if the first return value is True.
+    """
+
+    validator = getattr(spec, "_validator", None)
+    if validator is None:
+        assert isinstance(spec, Spec), "param spec must be an object of a 'Spec' class"
+        validator = spec.compile()
+
+    if _instrumentation is not None:
+        return _record_is_valid(validator, value, spec)
+
+    return validator(value)
+
+def validate_record(record, spec, fail_fast=False):
+    """
+    Validate every field of 'record' according to 'spec' and return the validated record and the errors of each invalid field, without raising any errors
+
+    :param record: A dictionary of field names to values, or a tuple or list of values in the order of the fields of 'spec'
+    :param spec: A 'SpecRecord', containing information on how to validate each field
+    :param fail_fast: Whether or not to stop at the first invalid field. Default: False
+    :return: The record with each valid field validated, as the same type as 'record'. Fields not in 'spec' are left as they are
+    :return: A dictionary of each invalid or missing field to the message of its specification, or to a dictionary of its own errors if it is a record itself.
+        A field whose specification raises an exception, such as for infinity when only integers are allowed, has the exception as its message instead.
+        Errors with the record as a whole, such as not being a record, are under None. This is empty if the record is valid
+    """
+
+    assert isinstance(spec, SpecRecord), "param spec must be an object of a 'SpecRecord' class"
+
+    errors = {}
+    validated = (spec._validator or spec.compile())(record, errors, fail_fast)[1]
+
+    return validated, errors
+
+def write_vocabulary(strings, path, to_lower=True):
+    """
+    Write 'strings' to a file at 'path' for a 'SpecStrFile' to allow, sorted, without duplicates and lowered if 'to_lower' is True
+
+    :param strings: An iterable of the allowed strings, none of which can contain a new line
+    :param path: The path of the file to write
+    :param to_lower: Whether or not to lower the strings, which must be the same as the 'SpecStrFile' allowing them. Default: True
+    :return: The number of strings written
+    """
+
+    lines = set()
+    for item in strings:
+        assert isinstance(item, str) and "\n" not in item, "all items in param strings must be strings without new lines"
+        lines.add(item.lower() if to_lower else item)
+
+    lines = sorted(lines)
+    with open(path, "w", encoding="utf-8", errors="surrogatepass", newline="\n") as file:
+        file.writelines([line + "\n" for line in lines])
+
+    return len(lines)
+
+def _after_prefix(prefix):
+    """
+    Private method which returns the first string after every string starting with 'prefix', or None if there isn't one
+    """
+
+    prefix = prefix.rstrip("\U0010ffff")
+    if not prefix:
+        return None
+
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+class PrefixValidator:
+    """
+    Checks what the user has typed so far against a specification as they type it, answering whether it could still become valid and whether it is valid already,
+    and suggests ways to finish it. Each check takes about the same time however many values the specification allows.
+    Uses the specification as it is when this is made, changing it afterwards doesn't change this
+
+    :param spec: A 'SpecStr' or 'SpecNum' or a descendant of either, containing information on how to validate
+    """
+
+    def __init__(self, spec):
+        """
+        Checks what the user has typed so far against a specification as they type it
+
+        :param spec: A 'SpecStr' or 'SpecNum' or a descendant of either, containing information on how to validate
+        """
+
+        assert isinstance(spec, (SpecStr, SpecNum)), "param spec must be an object of a 'SpecStr' or 'SpecNum' class"
+
+        self.spec = spec
+        self._validator = compile_spec(spec)
+        self._extra_values = [value for value in spec.extra_values or [] if isinstance(value, str)]
+        self._strings = None
+        self._file = None
+        self._chars = None
+        self._numbers = None
+
+        if isinstance(spec, SpecStrFile):
+            self._file = _sorted_file(spec.path)[1]
+        elif isinstance(spec, SpecStr):
+            if spec.allowed_strings is not None:
+                self._strings = sorted(set(spec.allowed_strings))
+                # suggestions are shown as they were given rather than lowered
+                self._shown = {}
+                for item, shown in zip(spec.allowed_strings, getattr(spec, "_shown_strings", spec.allowed_strings)):
+                    self._shown.setdefault(item, shown)
+            elif spec.allowed_chars is not None:
+                self._chars = _only_chars(spec.allowed_chars)
+        else:
+            self._min = getattr(spec, "min", None)
+            self._max = getattr(spec, "max", None)
+            if getattr(spec, "list_of_allowed", None) is not None:
+                self._numbers = sorted(spec.list_of_allowed)
+                self._strings = sorted(set([str(item) for item in spec.list_of_allowed]))
+                self._shown = {item: item for item in self._strings}
+            # how far outside the bounds a number can be and still be valid after rounding and converting to an integer
+            self._slack = 0 if spec.round_digits is None else 0.5 * 10.0 ** -spec.round_digits
+            if spec.type is int:
+                self._slack += 1
+
+        # the range of allowed strings starting with the last prefix checked, as the next prefix usually starts with it
+        self._last = "", 0, len(self._strings) if self._strings is not None else 0
+
+    def check(self, prefix):
+        """
+        Return whether or not 'prefix' could become valid according to the specification by typing more after it and whether or not it is valid already
+
+        :param prefix: The string typed so far
+        :return: Whether or not 'prefix' could become valid. Numbers are assumed to be written without an exponent until an 'e' is typed,
+            and this is also True if a number could only become one just outside the bounds of the specification
+        :return: Whether or not 'prefix' is valid now
+        """
+
+        if self._valid(prefix):
+            return True, True
+
+        return any([value.startswith(prefix) for value in self._extra_values]) or self._possible(prefix), False
+
+    def complete(self, prefix, limit=10):
+        """
+        Return up to 'limit' valid values starting with 'prefix', in order, to suggest to the user.
+        Suggests allowed strings, the lines of the file of a 'SpecStrFile', allowed numbers and the integers of integer ranges. Suggests nothing for other specifications
+
+        :param prefix: The string typed so far
+        :param limit: The most values to suggest. Default: 10
+        :return: A list of the suggested values as strings
+        """
+
+        key = self._key(prefix)
+        if self._strings is not None:
+            low, high = self._range(key)
+            found = [self._shown[item] for item in self._strings[low:min(high, low + limit)]]
+        elif self._file is not None:
+            found = self._file(key, limit)
+        elif self._chars is None and isinstance(self.spec, SpecNum) and self.spec.type is int:
+            found = self._integers(key, limit)
+        else:
+            found = []
+
+        found += [value for value in self._extra_values if value.startswith(prefix) and value not in found]
+
+        return found[:limit]
+
+    def _valid(self, prefix):
+        try:
+            return self._validator(prefix)[0]
+        except OverflowError:
+            # infinity can't be converted to an integer
+            return False
+
+    def _key(self, prefix):
+        # the prefix as it is compared with the allowed values, without the spaces it would be stripped of
+        key = prefix.lstrip()
+        if isinstance(self.spec, SpecStr) and self.spec.to_lower:
+            key = key.lower()
+
+        return key
+
+    def _range(self, key):
+        # the range of the allowed strings starting with key, only searching the range of the last prefix checked if key starts with it
+        last, low, high = self._last
+        if not key.startswith(last):
+            low = 0
+            high = len(self._strings)
+
+        low = bisect.bisect_left(self._strings, key, low, high)
+        after = _after_prefix(key)
+        if after is not None:
+            high = bisect.bisect_left(self._strings, after, low, high)
+        self._last = key, low, high
+
+        return low, high
+
+    def _possible(self, prefix):
+        key = self._key(prefix)
+        if self._file is not None:
+            return bool(self._file(key, 1))
+        if self._chars is not None:
+            return self._chars(key)
+        if isinstance(self.spec, SpecNum):
+            # nothing can come after spaces at the end of a number
+            return key == key.rstrip() and self._number_possible(key)
+        if self._strings is None:
+            return True
+
+        low, high = self._range(key)
+
+        return high > low
+
+    def _number_possible(self, key):
+        match = _NUMBER_PREFIX.fullmatch(key)
+        if match is None:
+            sign = key[:1] if key[:1] in ("+", "-") else ""
+            word = key[len(sign):].lower()
+            return any([name.startswith(word) and self._valid(sign + name) for name in _NUMBER_WORDS])
+
+        sign, whole, point, fraction, exponent = match.groups()
+        signs = [sign == "-"] if sign else [False, True]
+        if exponent is not None:
+            # with an exponent, the number can become almost any size
+            return bool(whole or fraction) and any([self._reachable(0, math.inf, negative) for negative in signs])
+
+        if point:
+            start = float(whole + "." + fraction) if whole or fraction else 0.0
+            return any([self._reachable(start, start + 10.0 ** -len(fraction), negative) for negative in signs])
+
+        if not whole or int(whole) == 0:
+            return any([self._reachable(0, math.inf, negative) for negative in signs])
+
+        # more whole digits make the number 10, 100, etc. times bigger, and decimal digits make it bigger by less than 1
+        whole = int(whole)
+        for negative in signs:
+            largest = (-self._min if self._min is not None else math.inf) if negative else (self._max if self._max is not None else math.inf)
+            if self._numbers is not None:
+                largest = -self._numbers[0] if negative else self._numbers[-1]
+            for digits in range(310):
+                start = whole * 10 ** digits
+                if start - self._slack > largest:
+                    break
+                if self._reachable(start, (whole + 1) * 10 ** digits, negative):
+                    return True
+
+        return False
+
+    def _reachable(self, start, end, negative):
+        # whether a number whose size is between start and end could be valid
+        low, high = (-end, -start) if negative else (start, end)
+        low -= self._slack
+        high += self._slack
+        if self._numbers is not None:
+            index = bisect.bisect_left(self._numbers, low)
+            return index < len(self._numbers) and self._numbers[index] <= high
+
+        return (self._min is None or high >= self._min) and (self._max is None or low <= self._max)
+
+    def _integers(self, key, limit):
+        # the integers in the range starting with key, with fewer digits first
+        if self._min is None or self._max is None or not (math.isfinite(self._min) and math.isfinite(self._max)):
+            return []
+        match = re.fullmatch(r"(-?)(\d*)", key)
+        if match is None:
+            return []
+
+        sign, whole = match.groups()
+        if len(whole) > 1 and whole[0] == "0":
+            # integers are only suggested without leading zeros, so none start with them
+            return []
+
+        found = []
+        for negative in ([True] if sign else [False, True]):
+            # the sizes of the integers allowed with this sign
+            smallest = max(-math.floor(self._max), 1) if negative else max(math.ceil(self._min), 0)
+            largest = -math.ceil(self._min) if negative else math.floor(self._max)
+            digits = 0
+            while len(found) < limit:
+                if whole:
+                    start = int(whole) * 10 ** digits
+                    end = (int(whole) + 1) * 10 ** digits
+                else:
+                    start = 0
+                    end = largest + 1
+                if start > largest:
+                    break
+                for number in range(max(start, smallest), min(end, largest + 1)):
+                    found.append(("-" if negative else "") + str(number))
+                    if len(found) == limit:
+                        break
+                if not whole or int(whole) == 0:
+                    break
+                digits += 1
+
+        return found[:limit]
+
+class _SpecStats:
+    """
+    Private class of what instrumentation has recorded about validating with the specifications with one name
+    """
+
+    __slots__ = ("calls", "passed", "failures", "buckets", "seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.passed = 0
+        self.failures = {}
+        self.buckets = [0] * (len(_LATENCY_BUCKETS) + 1)
+        self.seconds = 0.0
+
+def _failure_category(value):
+    """
+    Private method which returns the category of a value which wasn't valid for instrumentation, which is its datatype or 'blank' for empty strings
+    """
+
+    if isinstance(value, str) and not value.strip():
+        return "blank"
+
+    return type(value).__name__
+
+def _record_is_valid(validator, value, spec):
+    """
+    Private method used by 'is_valid' instead of calling 'validator' directly while instrumentation is enabled, recording the result and how long it took
+    """
+
+    start = perf_counter()
+    valid, validated = validator(value)
+    seconds = perf_counter() - start
+
+    stats = _instrumentation.get(spec)
+    if stats is None:
+        name = _instrumentation_names.get(spec)
+        if name is None:
+            name = repr(spec)
+        stats = _instrumentation_stats.setdefault(name, _SpecStats())
+        _instrumentation[spec] = stats
+
+    stats.calls += 1
+    if valid:
+        stats.passed += 1
+    else:
+        category = _failure_category(value)
+        stats.failures[category] = stats.failures.get(category, 0) + 1
+    stats.buckets[bisect.bisect_left(_LATENCY_BUCKETS, seconds)] += 1
+    stats.seconds += seconds
+
+    return valid, validated
+
+def enable_instrumentation(names=None):
+    """
+    Start recording how many values are validated with each specification, how many are valid, the category of those which aren't and how long each took.
+    This covers everything validated with 'is_valid', which 'assert_valid' and 'validate_input' use. When it isn't enabled, it costs one check per value
+
+    :param names: A dictionary of names to descendants of the 'Spec' class to record under these names. Others are recorded under their repr. Default: None
+    """
+
+    global _instrumentation
+
+    assert names is None or isinstance(names, dict) and all([isinstance(spec, Spec) for spec in names.values()]), "param names must be a dictionary of 'Spec' objects or None"
+
+    if names is not None:
+        _instrumentation_names.update({spec: name for name, spec in names.items()})
+    if _instrumentation is None:
+        _instrumentation = {}
+
+def disable_instrumentation():
+    """
+    Stop recording what is validated, keeping what has been recorded so far
+    """
+
+    global _instrumentation
+    _instrumentation = None
+
+def reset_instrumentation():
+    """
+    Forget everything instrumentation has recorded so far
+    """
+
+    _instrumentation_stats.clear()
+    if _instrumentation is not None:
+        _instrumentation.clear()
+
+def instrumentation_snapshot():
+    """
+    Return everything instrumentation has recorded so far, which can be converted to JSON
+
+    :return: A dictionary of the name or repr of each specification to a dictionary of 'calls', 'passed', 'failed', 'failures' (a dictionary of the category of invalid values to how many there were),
+        'latency_buckets' (a dictionary of each upper bound in seconds, ending with '+Inf', to the number of values which took at most that long) and 'latency_sum' (the total seconds)
+    """
+
+    snapshot = {}
+    for name, stats in _instrumentation_stats.items():
+        cumulative = list(itertools.accumulate(stats.buckets))
+        snapshot[name] = {
+            "calls": stats.calls,
+            "passed": stats.passed,
+            "failed": stats.calls - stats.passed,
+            "failures": dict(stats.failures),
+            "latency_buckets": dict(zip([repr(bound) for bound in _LATENCY_BUCKETS] + ["+Inf"], cumulative)),
+            "latency_sum": stats.seconds,
+        }
+
+    return snapshot
+
+def instrumentation_prometheus():
+    """
+    Return everything instrumentation has recorded so far in the Prometheus text format
+
+    :return: The metrics 'validation_calls_total', 'validation_passed_total', 'validation_failures_total' by category and the histogram 'validation_seconds', each labelled with the name or repr of the specification
+    """
+
+    def label(text):
+        return str(text).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+    snapshot = instrumentation_snapshot()
+    lines = ["# TYPE validation_calls_total counter"]
+    lines += ['validation_calls_total{{spec="{}"}} {}'.format(label(name), stats["calls"]) for name, stats in snapshot.items()]
+    lines.append("# TYPE validation_passed_total counter")
+    lines += ['validation_passed_total{{spec="{}"}} {}'.format(label(name), stats["passed"]) for name, stats in snapshot.items()]
+    lines.append("# TYPE validation_failures_total counter")
+    lines += ['validation_failures_total{{spec="{}",category="{}"}} {}'.format(label(name), label(category), count) for name, stats in snapshot.items() for category, count in stats["failures"].items()]
+    lines.append("# TYPE validation_seconds histogram")
+    for name, stats in snapshot.items():
+        lines += ['validation_seconds_bucket{{spec="{}",le="{}"}} {}'.format(label(name), bound, count) for bound, count in stats["latency_buckets"].items()]
+        lines.append('validation_seconds_sum{{spec="{}"}} {}'.format(label(name), stats["latency_sum"]))
+        lines.append('validation_seconds_count{{spec="{}"}} {}'.format(label(name), stats["calls"]))
+
+    return "\n".join(lines) + "\n"
+
+def _round_array(numbers, digits):
+    """
+    Private method which rounds a numpy array of floats to 'digits' decimal places giving exactly the same as the built-in round function on each number
+    numpy rounds the number multiplied by a power of 10, which has already been rounded to the nearest float, so wherever that could have moved it
+    across a halfway point the built-in round function is used instead
+    """
+
+    if digits == 0:
+        return _np.rint(numbers)
+
+    scale = 10.0 ** abs(digits)
+    with _np.errstate(over="ignore", invalid="ignore"):
+        scaled = numbers * scale if digits > 0 else numbers / scale
+        rounded = _np.rint(scaled)
+        rounded = rounded / scale if digits > 0 else rounded * scale
+        unsure = ~(_np.abs(_np.abs(scaled - _np.trunc(scaled)) - 0.5) > (_np.abs(scaled) + 1) * 2.0 ** -50)
+
+    if unsure.any():
+        rounded[unsure] = [round(number, digits) for number in numbers[unsure].tolist()]
+
+    return rounded
+
+def is_valid_array(values, spec):
+    """
+    Return which of 'values' are valid according to 'spec' and the validated 'values', checking a whole numpy array at once rather than one value at a time.
+    Gives exactly the same as calling 'is_valid' on each value, except that values which can't be converted to an integer, such as infinity and nan, are invalid rather than raising an error. Arrays which aren't numeric are still accepted but are checked one value at a time
+
+    :param values: A numpy array of the values to validate, or anything numpy can convert to one
+    :param spec: A 'SpecNum' or a descendant of it, containing information on how to validate
+    :return: A numpy array of booleans of whether or not each value was valid according to the specification
+    :return: A numpy array of the values after validation. Only the values where the first return value is True are valid.
+    """
+
+    _import_numpy("validate arrays")
+
+    assert isinstance(spec, SpecNum), "param spec must be an object of a 'SpecNum' class"
+
+    array = _np.asarray(values)
+    compiled = spec.compile()
+    digits = spec.round_digits
+
+    def validator(value):
+        try:
+            return compiled(value)
+        except (OverflowError, ValueError):
+            # infinity and nan can't be converted to an integer
+            return False, value
+
+    if array.dtype.kind not in "biuf" or (digits is not None and abs(digits) > 22):
+        results = [validator(value) for value in array.ravel().tolist()]
+        valid = _np.array([result[0] for result in results], dtype=bool).reshape(array.shape)
+        validated = _np.empty(len(results), dtype=object)
+        validated[:] = [result[1] for result in results]
+        return valid, validated.reshape(array.shape)
+
+    numbers = array.astype(_np.float64).ravel()
+    # values which are extra values or can't be handled exactly by numpy are left for the validator to check one at a time
+    each = _np.zeros(numbers.shape, dtype=bool)
+    if spec.extra_values:
+        extra_numbers = [value for value in spec.extra_values if isinstance(value, (int, float, _np.number, _np.bool_))]
+        if extra_numbers:
+            each = _np.isin(array.ravel(), extra_numbers)
+
+    if digits is not None:
+        numbers = _round_array(numbers, digits)
+
+    if spec.type is int or digits == 0:
+        # beyond 2 ** 53 numpy compares integers with floats inexactly and beyond 2 ** 63 they don't fit at all
+        each |= ~(_np.abs(numbers) < 2.0 ** 53)
+        numbers[each] = 0
+        numbers = numbers.astype(_np.int64)
+    elif digits is not None:
+        numbers = _round_array(numbers, digits)
+
+    if getattr(spec, "list_of_allowed", None) is not None:
+        valid = _np.isin(numbers, spec.list_of_allowed)
+    elif isinstance(spec, SpecNumRange) and spec.min is not None and spec.max is not None:
+        valid = (spec.min <= numbers) & (numbers <= spec.max)
+    elif isinstance(spec, SpecNumRange) and spec.min is not None:
+        valid = spec.min <= numbers
+    elif isinstance(spec, SpecNumRange) and spec.max is not None:
+        valid = numbers <= spec.max
+    else:
+        valid = _np.ones(numbers.shape, dtype=bool)
+
+    indexes = _np.flatnonzero(each)
+    if len(indexes):
+        for index, value in zip(indexes.tolist(), array.ravel()[indexes].tolist()):
+            valid[index], value = validator(value)
+            if not valid[index]:
+                continue
+            if numbers.dtype != object:
+                try:
+                    fits = numbers.dtype.type(value) == value
+                except OverflowError:
+                    fits = False
+                if not fits:
+                    numbers = numbers.astype(object)
+            numbers[index] = value
+
+    return valid.reshape(array.shape), numbers.reshape(array.shape)
+
+def is_valid_buffer(buffer, spec, dtype=None, offset=0, chunk_size=1048576, bitmask=False):
+    """
+    Return how many numbers in 'buffer' aren't valid according to 'spec' and where they are, reading the numbers straight from the buffer a chunk at a time
+    rather than making a Python object of each one, so memory use doesn't grow with the buffer. Gives exactly the same as 'is_valid_array', so numbers such as infinity and nan which can't be converted to an integer count as invalid
+
+    :param buffer: An 'array.array', 'memoryview', 'bytes', 'mmap' or anything else supporting the buffer protocol containing the numbers one after the other,
+        or the path of a file of them which is memory mapped. Memory use only stays bounded for a memory map made elsewhere if the system frees its pages
+    :param spec: A 'SpecNum' or a descendant of it, containing information on how to validate
+    :param dtype: The numpy datatype of the numbers, such as '<f8' or 'int32'. None uses the format of the buffer, which for 'bytes', 'mmap' and files is single bytes. Default: None
+    :param offset: The number of bytes at the start of the buffer to skip, such as a header. Default: 0
+    :param chunk_size: The number of numbers to check at a time. Default: 1048576
+    :param bitmask: Whether or not to return a packed bitmask of which numbers are valid rather than the positions of those which aren't. Default: False
+    :return: The number of numbers which weren't valid according to the specification
+    :return: A numpy array of the position of each number which wasn't valid, in order, or if 'bitmask' is True, a numpy array of bytes where bit i % 8 (the least significant first) of byte i // 8 is 1 if number i was valid
+    """
+
+    _import_numpy("validate buffers")
+
+    assert isinstance(spec, SpecNum), "param spec must be an object of a 'SpecNum' class"
+    assert isinstance(chunk_size, int) and chunk_size > 0, "param chunk_size must be a positive integer"
+
+    if isinstance(buffer, (str, os.PathLike)):
+        with open(buffer, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                buffer = b""
+            else:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return _check_buffer(mapped, spec, dtype, offset, chunk_size, bitmask, hasattr(mmap, "MADV_DONTNEED"))
+
+    return _check_buffer(buffer, spec, dtype, offset, chunk_size, bitmask, False)
+
+def _check_buffer(buffer, spec, dtype, offset, chunk_size, bitmask, release):
+    """
+    Private method which does the checking for 'is_valid_buffer', letting go of each page of 'buffer', which must be a read only memory map, once it is checked if 'release' is True
+    """
+
+    with memoryview(buffer) as view:
+        assert view.c_contiguous, "param buffer must be contiguous"
+        dtype = _np.dtype(view.format if dtype is None else dtype)
+        assert dtype.kind in "biuf", "param dtype must be a numeric datatype"
+        with view.cast("B") as raw:
+            size, remainder = divmod(len(raw) - offset, dtype.itemsize)
+            assert 0 <= offset <= len(raw) and not remainder, "param buffer must contain a whole number of values after the offset"
+
+            # each chunk is a multiple of 8 numbers so its bits fill whole bytes of the bitmask
+            chunk_size = -(-chunk_size // 8) * 8
+            invalid = 0
+            positions = []
+            packed = _np.zeros(-(-size // 8), dtype=_np.uint8) if bitmask else None
+            for start in range(0, size, chunk_size):
+                count = min(chunk_size, size - start)
+                numbers = _np.frombuffer(raw, dtype, count, offset + start * dtype.itemsize)
+                valid = is_valid_array(numbers, spec)[0]
+                invalid += count - int(_np.count_nonzero(valid))
+                if bitmask:
+                    packed[start // 8:start // 8 + -(-count // 8)] = _np.packbits(valid, bitorder="little")
+                else:
+                    positions.append(_np.flatnonzero(~valid) + start)
+                del numbers
+                if release:
+                    # pages of the file which have been checked are let go so the whole file doesn't end up in memory
+                    first = (offset + start * dtype.itemsize) // mmap.PAGESIZE * mmap.PAGESIZE
+                    buffer.madvise(mmap.MADV_DONTNEED, first, offset + (start + count) * dtype.itemsize - first)
+
+    if bitmask:
+        return invalid, packed
+
+    return invalid, _np.concatenate(positions) if positions else _np.empty(0, dtype=_np.int64)
+
+class _BadLine:
+    """
+    Private class holding a JSON line which couldn't be decoded as an object, along with why
+    """
+
+    __slots__ = ["line", "error"]
+
+    def __init__(self, line, error):
+        self.line = line
+        self.error = error
+
+def _jsonl_rows(file):
+    """
+    Private method which yields the object on each non-blank line of a JSON lines file, or a '_BadLine' for each line that isn't a JSON object
+    """
+
+    for line in file:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield _BadLine(line.rstrip("\r\n"), "Invalid JSON: " + str(e))
+            continue
+        if isinstance(row, dict):
+            yield row
+        else:
+            yield _BadLine(line.rstrip("\r\n"), "Not a JSON object")
+
+def validate_stream(path_or_file, column_specs, chunk_size=10000, form=None, summary=False):
+    """
+    Validate every row of a CSV or JSON lines file according to a specification for each column, reading 'chunk_size' rows at a time so only one chunk is ever in memory
+
+    :param path_or_file: The path of the file or an already open text file
+    :param column_specs: A dictionary of column names to a descendant of the 'Spec' class to validate that column with. Columns not in it are left as they are
+    :param chunk_size: The number of rows to read at once. Default: 10000
+    :param form: The form of the file, 'csv' or 'jsonl'. None works it out from the file extension, which is 'jsonl' for '.jsonl', '.ndjson' and '.json' and 'csv' otherwise. Default: None
+    :param summary: Whether or not to only count the invalid values rather than yielding every row. Default: False
+    :return: A generator yielding the row number (starting at 1), the row with its valid values validated and a dictionary of each invalid or missing column to the message of its specification, which is empty if the row is valid.
+        A value which makes its specification raise an exception has the exception as its message instead.
+        A JSON line which can't be decoded or isn't an object is yielded as the line itself with a dictionary of None to why it is invalid.
+        If summary is True, instead yields a dictionary after every chunk of 'rows', 'invalid_rows', 'failures' (a dictionary of column name, or None for invalid JSON lines, to number of invalid or missing values), 'seconds' and 'rows_per_second' so far
+    """
+
+    assert isinstance(column_specs, dict) and all([isinstance(spec, Spec) for spec in column_specs.values()]), "param column_specs must be a dictionary of 'Spec' objects"
+    assert isinstance(chunk_size, int) and chunk_size > 0, "param chunk_size must be a positive integer"
+
+    opened = not hasattr(path_or_file, "read")
+    if form is None:
+        name = path_or_file if opened else getattr(path_or_file, "name", "")
+        form = "jsonl" if os.path.splitext(str(name))[1].lower() in [".jsonl", ".ndjson", ".json"] else "csv"
+    form = assert_valid(form, SpecStr.shared(["csv", "jsonl"]), "param form")
+
+    validators = [(column, spec.compile()) for column, spec in column_specs.items()]
+    failures = dict.fromkeys(column_specs, 0)
+    rows = invalid_rows = 0
+    start = perf_counter()
+
+    file = open(path_or_file, newline="", encoding="utf-8", buffering=1 << 20) if opened else path_or_file
+    try:
+        # short rows in a CSV file have None for the missing columns whereas in JSON None is a value
+        csv_form = form == "csv"
+        reader = csv.DictReader(file) if csv_form else _jsonl_rows(file)
+
+        while True:
+            chunk = list(itertools.islice(reader, chunk_size))
+            if not chunk:
+                break
+
+            for row in chunk:
+                rows += 1
+                errors = {}
+                if isinstance(row, _BadLine):
+                    # a line that isn't a JSON object is yielded as it is with its error under the column None
+                    row, errors[None] = row.line, row.error
+                    validators_here = ()
+                else:
+                    validators_here = validators
+                for column, validator in validators_here:
+                    value = row.get(column, _MISSING)
+                    if value is _MISSING or value is None and csv_form:
+                        errors[column] = "Missing"
+                        continue
+                    try:
+                        valid, value = validator(value)
+                    except Exception as error:
+                        # such as infinity for a specification of integers, which mustn't stop the rest of the file being validated
+                        errors[column] = "{}: {}".format(type(error).__name__, error)
+                        continue
+                    if valid:
+                        row[column] = value
+                    else:
+                        errors[column] = column_specs[column].msg
+
+                if errors:
+                    invalid_rows += 1
+                    if summary:
+                        for column in errors:
+                            failures[column] = failures.get(column, 0) + 1
+
+                if not summary:
+                    yield rows, row, errors
+
+            if summary:
+                seconds = perf_counter() - start
+                yield {
+                    "rows": rows,
+                    "invalid_rows": invalid_rows,
+                    "failures": failures.copy(),
+                    "seconds": seconds,
+                    "rows_per_second": rows / seconds if seconds else float("inf"),
+                }
+    finally:
+        if opened:
+            file.close()
+
+# the validator of the specification sent to each worker process by 'validate_many'
+_worker_validator = None
+
+def _start_worker(spec):
+    """
+    Private method run once in each worker process of 'validate_many' to compile the specification it was sent
+    """
+
+    global _worker_validator
+    _worker_validator = spec.compile()
+
+def _validate_chunk(chunk):
+    """
+    Private method run in a worker process of 'validate_many' to validate a chunk of values
+    """
+
+    return [_worker_validator(value) for value in chunk]
+
+def validate_many(values, spec, workers=None, chunksize=10000, min_parallel=200000):
+    """
+    Return whether or not each of 'values' is valid according to 'spec' and the validated value, splitting them between several processes.
+    The specification is sent to each process once and the values in chunks. If there are fewer than 'min_parallel' values or only 1 worker,
+    they are validated in this process instead as starting the processes would take longer than it saves
+
+    :param values: An iterable of the values to validate. They must be able to be pickled
+    :param spec: A descendant of the 'Spec' class, containing information on how to validate
+    :param workers: The number of processes to use. None uses the number of CPUs. Default: None
+    :param chunksize: The number of values to send to a process at once. Default: 10000
+    :param min_parallel: The fewest values to use several processes for. Default: 200000
+    :return: A list of the same as 'is_valid' returns for each value, in the same order as 'values'
+    """
+
+    assert isinstance(spec, Spec), "param spec must be an object of a 'Spec' class"
+    assert workers is None or isinstance(workers, int) and workers > 0, "param workers must be a positive integer or None"
+    assert isinstance(chunksize, int) and chunksize > 0, "param chunksize must be a positive integer"
+
+    values = values if isinstance(values, (list, tuple)) else list(values)
+    workers = min(workers or os.cpu_count() or 1, -(-len(values) // chunksize))
+
+    if workers <= 1 or len(values) < min_parallel:
+        validator = spec.compile()
+        return [validator(value) for value in values]
+
+    chunks = [values[start:start + chunksize] for start in range(0, len(values), chunksize)]
+    import concurrent.futures
+
+    with concurrent.futures.ProcessPoolExecutor(workers, initializer=_start_worker, initargs=(spec,)) as executor:
+        return [result for results in executor.map(_validate_chunk, chunks) for result in results]
+
+class BatchInputError(EOFError):
+    """
+    Raised by 'validate_input' in batch mode when standard input ends, or too many lines in a row are rejected, before a valid line
+
+    :param message: The reason it was raised
+    :param rejected: A list of a dictionary for each line rejected so far of its 'line' number, its 'text' and the 'message' it was rejected with
+    """
+
+    def __init__(self, message, rejected):
+        super().__init__(message)
+        self.rejected = rejected
+
+class _BatchInput:
+    """
+    Private class which reads lines from standard input for 'validate_input' in batch mode, and records which were rejected
+    """
+
+    __slots__ = ("stream", "line_number", "accepted", "rejected", "output")
+
+    def __init__(self, stdin):
+        self.stream = stdin
+        self.line_number = 0
+        self.accepted = 0
+        self.rejected = []
+        self.output = []
+
+    def readline(self):
+        # returns the next line without its new line like 'input', or None if standard input has ended
+        # reads through the same buffer as 'input' and only one line at a time, so using 'input' as well gets the lines which follow
+        # what is waiting to be shown is written first, as what is writing standard input may wait for the prompt before writing the line
+        self.write()
+        line = self.stream.readline()
+        if not line:
+            return None
+
+        self.line_number += 1
+
+        return line[:-1] if line[-1] == "\n" else line
+
+    def write(self):
+        # shows what is waiting to be shown at once rather than a line at a time, flushing it like 'input' does
+        if self.output:
+            sys.stdout.write("".join(self.output))
+            self.output.clear()
+        sys.stdout.flush()
+
+    def validate(self, spec, prompt):
+        # shows the same as asking interactively would, the message of each rejected line with the next prompt
+        rejected = 0
+        try:
+            while True:
+                if prompt is not None:
+                    self.output.append(str(prompt))
+                line = self.readline()
+                if line is None:
+                    raise BatchInputError("standard input ended before a valid line", self.rejected)
+                acceptable, value = is_valid(line, spec)
+                if acceptable:
+                    self.accepted += 1
+                    return value
+                self.output.append(spec.msg + "\n")
+                self.rejected.append({"line": self.line_number, "text": line, "message": spec.msg})
+                rejected += 1
+                if rejected >= _batch_max_rejected:
+                    raise BatchInputError("{} lines in a row were rejected".format(rejected), self.rejected)
+        finally:
+            self.write()
+
+def _batch_input():
+    """
+    Private method which returns what reads standard input in batch mode, or None if 'validate_input' shouldn't use batch mode
+    """
+
+    global _batch
+    stdin = sys.stdin
+    if stdin is None or _batch_enabled is False or (_batch_enabled is None and stdin.isatty()):
+        return None
+
+    if _batch is None or _batch.stream is not stdin:
+        _batch = _BatchInput(stdin)
+
+    return _batch
+
+def batch_mode(enabled=None, max_rejected=1000):
+    """
+    Set when 'validate_input', and so 'true_false', 'date', 'time' and 'datetime', read standard input in batch mode.
+    Batch mode validates each line of standard input in the same way, shows what asking interactively would, writing it just before reading each line,
+    records each rejected line and raises a 'BatchInputError' rather than waiting for a valid line forever. It never reads past the line it validates, so 'input' can be used as well
+
+    :param enabled: True to always use batch mode, False to never or None to use it only when standard input isn't interactive, such as a pipe or file. Default: None
+    :param max_rejected: The most lines in a row which can be rejected before a 'BatchInputError' is raised. Default: 1000
+    """
+
+    global _batch_enabled, _batch_max_rejected
+
+    assert enabled in (True, False, None), "param enabled must be True, False or None"
+    assert isinstance(max_rejected, int) and max_rejected > 0, "param max_rejected must be a positive integer"
+
+    _batch_enabled = enabled
+    _batch_max_rejected = max_rejected
+
+def batch_summary():
+    """
+    Return what has happened in batch mode so far
+
+    :return: A dictionary of the number of 'lines' read, the number 'accepted' and 'rejected', a list of a dictionary for each rejected line
+        of its 'line' number, its 'text' and the 'message' it was rejected with, or None if batch mode hasn't been used
+    """
+
+    if _batch is None:
+        return None
+
+    return {"lines": _batch.line_number, "accepted": _batch.accepted, "rejected": list(_batch.rejected)}
+
+def validate_input(spec, prompt=None):
+    """
+    Repeatedly ask the user for input until their input is valid according to 'spec' and return their validated input
+
+    :param spec: A descendant of the 'Spec' class, containing information on how to validate
+    :param prompt: The prompt to display to the user before asking them to input. None displays nothing. Default: None
+    :return: The valid value the user input
+    """
+
+    batch = _batch_input()
+    if batch is not None:
+        return batch.validate(spec, prompt)
+
+    acceptable = False
+    while not acceptable:
+        acceptable, value = is_valid(input(prompt) if prompt is not None else input(), spec)
+        if not acceptable:
+            print(spec.msg)
+
+    return value
+
+def assert_valid(value, spec, name=None):
+    """
+    Throw an assertion error if 'value' is invalid according to 'spec', otherwise return it
+
+    :param value: The value to validate
+    :param spec: A descendant of the 'Spec' class, containing information on how to validate
+    :param name: The name to reference the value so it is clear what is invalid in error messages. None just displays the error message. Default: None
+    :return value: If it hasn't thrown an assertion error, returns the valid value after normalisation
+    """
+
+    valid, value = is_valid(value, spec)
+
+    assert valid, spec.msg if name is None else str(name).strip().lower() + ": " + spec.msg
+
+    return value
+
+def true_false(prompt=None, extra_values=None):
+    """
+    Repeatedly ask the user for an input until they input a boolean-like value and return the boolean version
+
+    :param prompt: The prompt to display to the user before asking them to input. None will not display anything. Default: None
+    :param extra_values: A list of extra values it can take to be None. Default: None
+    :return: True or False depending on the user's input or None if extra_values and they input one of these
+    """
+
+    value = validate_input(specTrueFalse, prompt)
+
+    if extra_values is not None and value in extra_values:
+        return None
+
+    if value in ["f", "false", "n", "no", "0", "off", "disabled", "disable"]:
+        return False
+
+    return True
+
+def date(prompt=None, enforce=True, form="exact", fill_0s=True):
+    """
+    Repeatedly ask the user for a year, month and day until they input valid values and return this in a defined format
+
+    :param prompt: Message to display to the user before asking them for inputs. Default: None
+    :param enforce: Whether or not to enforce valid dates. If False, will allow empty inputs. Default: True
+    :param form: The form to output the date in. Default: 'exact'. Must be one of the following:
+        - 'exact': year-month-day
+        - 'uk': day/month/year
+        - 'us': month/day/year
+        - 'long': day_with_suffix month_as_word, year
+    :param fill_0s: Whether or not to fill numerical dates with leading 0s. Doesn't apply to 'long' form
+    """
+
+    extras = None if enforce else [""]
+
+    form = assert_valid(form, SpecStr.shared(["exact", "uk", "us", "long"]), "param form")
+
+    if prompt is not None:
+        print(prompt, "\n")
+
+    year = validate_input(SpecNumRange.shared(restrict_to_int=True, extra_values=extras), "Year: " if enforce else "Year (can leave blank): ")
+
+    leap_year = enforce and _is_leap_year(year)
+
+    month = validate_input(SpecStr.shared(_MONTH_INPUTS, extra_values=extras), "Month: " if enforce else "Month (can leave blank): ")
+    if month in _MONTH_NUMBERS:
+        month = _MONTH_NUMBERS[month]
+
+    days = _MONTH_DAYS[enforce and leap_year][month] if isinstance(month, int) else 31
+
+    day = validate_input(SpecNumRange.shared(1, days, None, True, extras), "Date/day: " if enforce else "Date/day (can leave blank): ")
+
+    return _format_date(year, month, day, form, fill_0s)
+
+def time(prompt=None, output_hour_clock=24, milli_seconds=False, fill_0s=True, allow_na=False):
+    """
+    Repeatedly ask the user to input hours, minutes and seconds until they input valid values and return this in a defined format
+
+    :param prompt: Message to display to the user before asking them for inputs. Default: None
+    :param output_hour_clock: Whether to output in 24 hour clock or in 12 hour clock with AM/PM. Default: 24
+    :param milli_seconds: Whether or not to allow more accuracy in seconds. Default: False
+    :param fill_0s: Whether or not to fill numerical times with leading 0s. Default: False
+    :param allow_na: Whether or not to allow empty inputs too. Default: False
+    """
+
+    extras = None if allow_na else [""]
+
+    output_hour_clock = assert_valid(output_hour_clock, SpecNumList.shared([12, 24], None, True), "param output_hour_clock")
+
+    if prompt is not None:
+        print(prompt, "\n")
+
+    input_hour_clock = validate_input(SpecNumList.shared([12, 24], None, True), "Input hour clock (12/24): ")
+
+    if input_hour_clock == 12:
+        hours = validate_input(SpecNumRange.shared(1, 12, None, True, extras), "Hours (12 hour clock): ")
+        period = validate_input(SpecStr.shared(["am", "pm"], extra_values=extras), "AM or PM? ")
+        if hours == 12:
+            hours = 0
+        if period == "pm":
+            hours += 12
+    else:
+        hours = validate_input(SpecNumRange.shared(0, 23, None, True, extras), "Hours (24 hour clock): ")
+
+    minutes = validate_input(SpecNumRange.shared(0, 59, None, True, extras), "Minutes: ")
+
+    if milli_seconds:
+        seconds = validate_input(SpecNumRange.shared(0, 59.999999, 6, False, extras), "Seconds including decimal: ")
+    else:
+        seconds = validate_input(SpecNumRange.shared(0, 59, 0, True, extras), "Seconds: ")
+
+    return _format_time(hours, minutes, seconds, output_hour_clock, fill_0s)
+
+def datetime(prompt=None, enforce=True, form="exact", milli_seconds=False, fill_0s=True):
+    """
+    Repeatedly ask the user to input a year, month, day, hours, minutes and seconds until they input valid values and return this in a defined format
 
     :param prompt: Message to display to the user before asking them for inputs. Default: None
     :param enforce: Whether or not to enforce valid dates. If False, will allow empty inputs. Default: True
     :param form: The form to output the datetime in. Default: exact
         - 'exact': year-month-day hour_in_24_hour_clock:minute:second
         - 'long': day_with_suffix month_as_word, year hour_in_12_hour_clock:minute:second AM_or_PM
-    :param milli_seconds: Whether or not to allow more accuracy when inputting seconds. Default: False
+    :param milli_seconds: Whether or not to allow more accuracy when inputting seconds. Default: False
+    :param fill_0s: Whether or not to fill numerical datetimes with leading 0s. Default: True
+    """
+
+    form = assert_valid(form, SpecStr.shared(["exact", "long"]), "param form")
+
+    if prompt is not None:
+        print(prompt, "\n")
+
+    date_ = date(None, enforce, form, fill_0s)
+    time_ = time(None, 24 if form == "exact" else 12, milli_seconds, fill_0s, not enforce)
+
+    return "{} {}".format(date_, time_)
+
+def _is_leap_year(year):
+    """
+    Private method which returns whether or not 'year' is a leap year
+    """
+
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+def _whole_number(value):
+    """
+    Private method which returns 'value' as an integer in the same way as 'SpecNum' with restrict_to_int, or None if it isn't valid, including when it is infinite or too large for a float
+    Strings of digits are converted directly, which is the same as converting through a float as long as they fit in one exactly
+    """
+
+    if type(value) is str:
+        try:
+            number = int(value)
+        except ValueError:
+            pass
+        else:
+            if -_MAX_EXACT_FLOAT <= number <= _MAX_EXACT_FLOAT:
+                return number
+
+    try:
+        valid, number = _validate_whole_number(value)
+    except (OverflowError, ValueError):
+        return None
+
+    return number if valid else None
+
+def _check_date(year, month, day):
+    """
+    Private method which returns the year, month and day as integers if they make a valid date, otherwise None
+    """
+
+    year = _whole_number(year)
+    if year is None:
+        return None
+
+    number = _MONTH_NUMBERS.get((month.strip() if isinstance(month, str) else str(month)).lower())
+    if number is None:
+        # also allows months written with a leading 0
+        number = _whole_number(month)
+        if number is None or not 1 <= number <= 12:
+            return None
+
+    day = _whole_number(day)
+    if day is None or not 1 <= day <= _MONTH_DAYS[_is_leap_year(year)][number]:
+        return None
+
+    return year, number, day
+
+def _check_time(hours, minutes, seconds, period, milli_seconds):
+    """
+    Private method which returns the hours in 24 hour clock, minutes and seconds as numbers if they make a valid time, otherwise None
+    The hours are in 12 hour clock if there is a period, otherwise 24 hour clock
+    """
+
+    hours = _whole_number(hours)
+    if hours is None:
+        return None
+
+    if period is None:
+        if not 0 <= hours <= 23:
+            return None
+    else:
+        valid, period = _validate_period(period)
+        if not valid or not 1 <= hours <= 12:
+            return None
+        if hours == 12:
+            hours = 0
+        if period == "pm":
+            hours += 12
+
+    minutes = _whole_number(minutes)
+    if minutes is None or not 0 <= minutes <= 59:
+        return None
+
+    try:
+        valid, seconds = (_validate_milli_seconds if milli_seconds else _validate_seconds)(seconds)
+    except (OverflowError, ValueError):
+        return None
+    if not valid:
+        return None
+
+    return hours, minutes, seconds
+
+def _format_date(year, month, day, form, fill_0s):
+    """
+    Private method which returns a date in the form given, as 'date' and 'is_valid_date' do
+    """
+
+    if year is None:
+        year = "?"
+
+    if month is None:
+        month = "?"
+
+    if day is None:
+        day = "?"
+
+    if form == "long":
+        return "{}{} {}, {}".format(day, _DAY_SUFFIXES[day % 10], _MONTH_NAMES[month - 1], year)
+
+    if fill_0s and month != "?" and day != "?":
+        if month < 10:
+            month = "0" + str(month)
+        if day < 10:
+            day = "0" + str(day)
+
+    if form == "exact":
+        return "{}-{}-{}".format(year, month, day)
+
+    if form == "us":
+        return "{}/{}/{}".format(month, day, year)
+
+    return "{}/{}/{}".format(day, month, year)
+
+def _format_time(hours, minutes, seconds, output_hour_clock, fill_0s):
+    """
+    Private method which returns a time given in 24 hour clock in the hour clock given, as 'time' and 'is_valid_time' do
+    """
+
+    if hours is not None and output_hour_clock == 12:
+        if hours < 12:
+            period = "AM"
+        else:
+            period = "PM"
+
+        hours %= 12
+        if hours == 0:
+            hours = 12
+
+    if fill_0s:
+        if hours is not None and hours < 10:
+            hours = "0" + str(hours)
+        if minutes is not None and minutes < 10:
+            minutes = "0" + str(minutes)
+        if seconds is not None and seconds < 10:
+            seconds = "0" + str(seconds)
+
+    to_return = "{}:{}:{}".format(hours, minutes, seconds)
+
+    if output_hour_clock == 12:
+        to_return += " {}".format(period)
+
+    return to_return
+
+def is_valid_date(year, month, day, form="exact", fill_0s=True):
+    """
+    Return whether or not 'year', 'month' and 'day' make a valid date and the date in a defined format, without asking the user for input
+
+    :param year: The year, as a number or string
+    :param month: The month, as a number or string of its number or the first 3 letters of its name
+    :param day: The day of the month, as a number or string
+    :param form: The form to output the date in. Default: 'exact'. Must be one of the following:
+        - 'exact': year-month-day
+        - 'uk': day/month/year
+        - 'us': month/day/year
+        - 'long': day_with_suffix month_as_word, year
+    :param fill_0s: Whether or not to fill numerical dates with leading 0s. Doesn't apply to 'long' form. Default: True
+    :return: Whether or not the date is valid
+    :return: The date in the form given if it is valid, otherwise None
+    """
+
+    form = assert_valid(form, SpecStr.shared(["exact", "uk", "us", "long"]), "param form")
+
+    date_ = _check_date(year, month, day)
+    if date_ is None:
+        return False, None
+
+    return True, _format_date(*date_, form, fill_0s)
+
+def is_valid_time(hours, minutes, seconds, period=None, output_hour_clock=24, milli_seconds=False, fill_0s=True):
+    """
+    Return whether or not 'hours', 'minutes' and 'seconds' make a valid time and the time in a defined format, without asking the user for input
+
+    :param hours: The hours, as a number or string, in 12 hour clock if there is a period, otherwise 24 hour clock
+    :param minutes: The minutes, as a number or string
+    :param seconds: The seconds, as a number or string
+    :param period: 'AM' or 'PM' if the hours are in 12 hour clock. None means they are in 24 hour clock. Default: None
+    :param output_hour_clock: Whether to output in 24 hour clock or in 12 hour clock with AM/PM. Default: 24
+    :param milli_seconds: Whether or not to allow more accuracy in seconds. Default: False
+    :param fill_0s: Whether or not to fill numerical times with leading 0s. Default: True
+    :return: Whether or not the time is valid
+    :return: The time in the hour clock given if it is valid, otherwise None
+    """
+
+    output_hour_clock = assert_valid(output_hour_clock, SpecNumList.shared([12, 24], None, True), "param output_hour_clock")
+
+    time_ = _check_time(hours, minutes, seconds, period, milli_seconds)
+    if time_ is None:
+        return False, None
+
+    return True, _format_time(*time_, output_hour_clock, fill_0s)
+
+def is_valid_datetime(year, month, day, hours, minutes, seconds, period=None, form="exact", milli_seconds=False, fill_0s=True):
+    """
+    Return whether or not the parameters make a valid date and time and the datetime in a defined format, without asking the user for input
+
+    :param year: The year, as a number or string
+    :param month: The month, as a number or string of its number or the first 3 letters of its name
+    :param day: The day of the month, as a number or string
+    :param hours: The hours, as a number or string, in 12 hour clock if there is a period, otherwise 24 hour clock
+    :param minutes: The minutes, as a number or string
+    :param seconds: The seconds, as a number or string
+    :param period: 'AM' or 'PM' if the hours are in 12 hour clock. None means they are in 24 hour clock. Default: None
+    :param form: The form to output the datetime in. Default: exact
+        - 'exact': year-month-day hour_in_24_hour_clock:minute:second
+        - 'long': day_with_suffix month_as_word, year hour_in_12_hour_clock:minute:second AM_or_PM
+    :param milli_seconds: Whether or not to allow more accuracy in seconds. Default: False
     :param fill_0s: Whether or not to fill numerical datetimes with leading 0s. Default: True
+    :return: Whether or not the datetime is valid
+    :return: The datetime in the form given if it is valid, otherwise None
     """
 
-    form = assert_valid(form, SpecStr(["exact", "long"]), "param form")
+    form = assert_valid(form, SpecStr.shared(["exact", "long"]), "param form")
 
-    if prompt is not None:
-        print(prompt, "\n")
+    date_ = _check_date(year, month, day)
+    time_ = _check_time(hours, minutes, seconds, period, milli_seconds)
+    if date_ is None or time_ is None:
+        return False, None
 
-    date_ = date(None, enforce, form, fill_0s)
-    time_ = time(None, 24 if form == "exact" else 12, milli_seconds, fill_0s, not enforce)
+    return True, "{} {}".format(_format_date(*date_, form, fill_0s), _format_time(*time_, 24 if form == "exact" else 12, fill_0s))
 
-    return "{} {}".format(date_, time_)
+def _parse_date(string, input_form):
+    """
+    Private method which returns the year, month and day in 'string' as integers if it is a valid date written in 'input_form', otherwise None
+    """
+
+    separator, year, month, day = _DATE_INPUT_FORMS[input_form]
+    parts = string.split(separator)
+    if len(parts) != 3:
+        return None
+
+    return _check_date(parts[year], parts[month], parts[day])
+
+def _parse_time(string, milli_seconds):
+    """
+    Private method which returns the hours in 24 hour clock, minutes and seconds in 'string' as numbers if it is a valid time, otherwise None
+    """
+
+    parts = string.split()
+    if len(parts) == 2:
+        string, period = parts
+    elif len(parts) == 1:
+        period = None
+    else:
+        return None
+
+    parts = string.split(":")
+    if len(parts) != 3:
+        return None
+
+    return _check_time(parts[0], parts[1], parts[2], period, milli_seconds)
+
+def parse_dates(strings, form="exact", fill_0s=True, input_form="exact"):
+    """
+    Return whether or not each of 'strings' is a valid date and the date in a defined format
+
+    :param strings: An iterable of strings of dates written in 'input_form', where the month can be its number or the first 3 letters of its name
+    :param form: The form to output the dates in. Default: 'exact'. Must be one of the following:
+        - 'exact': year-month-day
+        - 'uk': day/month/year
+        - 'us': month/day/year
+        - 'long': day_with_suffix month_as_word, year
+    :param fill_0s: Whether or not to fill numerical dates with leading 0s. Doesn't apply to 'long' form. Default: True
+    :param input_form: The form the dates are written in, one of 'exact', 'uk' or 'us' as above. Default: 'exact'
+    :return: A list of whether or not each date is valid and the date in the form given if it is, otherwise None, in the same order as 'strings'
+    """
+
+    form = assert_valid(form, SpecStr.shared(["exact", "uk", "us", "long"]), "param form")
+    input_form = assert_valid(input_form, SpecStr.shared(["exact", "uk", "us"]), "param input_form")
+
+    results = []
+    for string in strings:
+        date_ = _parse_date(string, input_form)
+        results.append((False, None) if date_ is None else (True, _format_date(*date_, form, fill_0s)))
+
+    return results
+
+def parse_times(strings, output_hour_clock=24, milli_seconds=False, fill_0s=True):
+    """
+    Return whether or not each of 'strings' is a valid time and the time in a defined format
+
+    :param strings: An iterable of strings of times written as hours:minutes:seconds in 24 hour clock, or in 12 hour clock followed by a space and AM or PM
+    :param output_hour_clock: Whether to output in 24 hour clock or in 12 hour clock with AM/PM. Default: 24
+    :param milli_seconds: Whether or not to allow more accuracy in seconds. Default: False
+    :param fill_0s: Whether or not to fill numerical times with leading 0s. Default: True
+    :return: A list of whether or not each time is valid and the time in the hour clock given if it is, otherwise None, in the same order as 'strings'
+    """
+
+    output_hour_clock = assert_valid(output_hour_clock, SpecNumList.shared([12, 24], None, True), "param output_hour_clock")
+
+    results = []
+    for string in strings:
+        time_ = _parse_time(string, milli_seconds)
+        results.append((False, None) if time_ is None else (True, _format_time(*time_, output_hour_clock, fill_0s)))
+
+    return results
+
+def parse_datetimes(strings, form="exact", milli_seconds=False, fill_0s=True, input_form="exact"):
+    """
+    Return whether or not each of 'strings' is a valid datetime and the datetime in a defined format
+
+    :param strings: An iterable of strings of a date written in 'input_form' followed by a space and a time written as in 'parse_times'
+    :param form: The form to output the datetimes in. Default: exact
+        - 'exact': year-month-day hour_in_24_hour_clock:minute:second
+        - 'long': day_with_suffix month_as_word, year hour_in_12_hour_clock:minute:second AM_or_PM
+    :param milli_seconds: Whether or not to allow more accuracy in seconds. Default: False
+    :param fill_0s: Whether or not to fill numerical datetimes with leading 0s. Default: True
+    :param input_form: The form the dates are written in, one of 'exact', 'uk' or 'us' as in 'parse_dates'. Default: 'exact'
+    :return: A list of whether or not each datetime is valid and the datetime in the form given if it is, otherwise None, in the same order as 'strings'
+    """
+
+    form = assert_valid(form, SpecStr.shared(["exact", "long"]), "param form")
+    input_form = assert_valid(input_form, SpecStr.shared(["exact", "uk", "us"]), "param input_form")
+    output_hour_clock = 24 if form == "exact" else 12
+
+    results = []
+    for string in strings:
+        parts = string.split(None, 1)
+        date_ = _parse_date(parts[0], input_form) if len(parts) == 2 else None
+        time_ = _parse_time(parts[1], milli_seconds) if date_ is not None else None
+        if time_ is None:
+            results.append((False, None))
+        else:
+            results.append((True, "{} {}".format(_format_date(*date_, form, fill_0s), _format_time(*time_, output_hour_clock, fill_0s))))
+
+    return results
+
+# the specification classes which can be registered with a 'ValidationServer' by their names
+_SPEC_CLASSES = {cls.__name__: cls for cls in [SpecStr, SpecNum, SpecNumRange, SpecNumList, SpecRecord, SpecAll, SpecAny, SpecNot]}
+
+# the classes 'cached_specs' can make, which can also read files as they aren't made by clients
+_CACHE_CLASSES = dict(_SPEC_CLASSES, SpecStrFile=SpecStrFile)
+
+def _spec_from_json(description, specs, classes=_SPEC_CLASSES):
+    """
+    Private method which returns the specification described by 'description', a dictionary of its 'class' name, one of 'classes', and the keyword parameters 'kwargs' to make it with
+    The fields of a 'SpecRecord' and the specifications combined by a 'SpecAll', 'SpecAny' or 'SpecNot' are the names of specifications in 'specs'
+    """
+
+    assert isinstance(description, dict) and description.get("class") in classes, "spec must be a dictionary with 'class' one of the following: " + ", ".join(["'{}'".format(name) for name in classes])
+
+    kwargs = dict(description.get("kwargs", {}))
+    if description["class"] == "SpecRecord":
+        kwargs["fields"] = {field: specs[name] for field, name in kwargs["fields"].items()}
+    elif description["class"] in ("SpecAll", "SpecAny"):
+        kwargs["specs"] = [specs[name] for name in kwargs["specs"]]
+    elif description["class"] == "SpecNot":
+        kwargs["spec"] = specs[kwargs["spec"]]
+
+    return classes[description["class"]](**kwargs)
+
+def _cache_key(descriptions, file_threshold):
+    """
+    Private method which returns a hash of 'descriptions', or the file of them, along with everything else that changes the specifications 'cached_specs' makes from them
+    """
+
+    import hashlib
+
+    digest = hashlib.sha256()
+    if isinstance(descriptions, (str, os.PathLike)):
+        with open(descriptions, "rb") as file:
+            digest.update(file.read())
+    else:
+        digest.update(json.dumps(descriptions, sort_keys=True).encode("utf-8", "surrogatepass"))
+
+    # a different version of this module or python could make or pickle them differently
+    with open(__file__, "rb") as file:
+        digest.update(file.read())
+    digest.update("{} {} {}".format(_CACHE_VERSION, sys.version, file_threshold).encode())
+
+    return digest.hexdigest()
+
+def _file_stamp(path):
+    """
+    Private method which returns the size and time last modified of the file at 'path', which change whenever it is written
+    """
+
+    stat = os.stat(path)
+
+    return [stat.st_size, stat.st_mtime_ns]
+
+def _temporary_path(path):
+    """
+    Private method which returns the path of a file for this process and thread to write before replacing the file at 'path' with it,
+    so no process ever reads half of it and processes writing it at the same time don't write over each other's
+    """
+
+    import threading
+
+    return "{}.{}.{}.tmp".format(path, os.getpid(), threading.get_ident())
+
+def _read_cache(cache_path, key):
+    """
+    Private method which returns the specifications in the cache at 'cache_path' if it was made with 'key' and the files it uses haven't changed since, otherwise None
+    """
+
+    import pickle
+
+    try:
+        with open(cache_path, "rb") as file:
+            header = json.loads(file.readline())
+            if header["version"] != _CACHE_VERSION or header["key"] != key:
+                return None
+            if any([_file_stamp(path) != stamp for path, stamp in header["files"]]):
+                return None
+            return pickle.load(file)
+    except Exception:
+        # a cache which can't be read is made again
+        return None
+
+def cached_specs(descriptions, cache_path, file_threshold=10000):
+    """
+    Return a dictionary of names to specifications made from 'descriptions', loading them from the cache at 'cache_path' if it was made from the same descriptions,
+    otherwise making them and saving them there. Loading them skips checking their parameters, lowering their strings, etc. and allowed strings longer than
+    'file_threshold' are kept in sorted files beside the cache and used as a 'SpecStrFile', so they are searched rather than loaded.
+    The cache is made again whenever the descriptions, this module, the version of Python or the files beside it change
+
+    :param descriptions: A dictionary of names to descriptions of specifications, each a dictionary of its 'class' name and the keyword parameters 'kwargs' to make it with
+        as registered with a 'ValidationServer', or the path of a JSON file of one. The fields of a 'SpecRecord' and the specifications combined by a 'SpecAll', 'SpecAny' or 'SpecNot' are the names of specifications described before it
+    :param cache_path: The path of the file to cache the specifications in
+    :param file_threshold: The most allowed strings a 'SpecStr' can have before they are kept in a file. Default: 10000
+    :return: A dictionary of names to specifications
+    """
+
+    cache_path = os.fspath(cache_path)
+    key = _cache_key(descriptions, file_threshold)
+    specs = _read_cache(cache_path, key)
+    if specs is not None:
+        return specs
+
+    if isinstance(descriptions, (str, os.PathLike)):
+        with open(descriptions, encoding="utf-8") as file:
+            descriptions = json.load(file)
+
+    specs = {}
+    files = []
+    for name, description in descriptions.items():
+        is_str = isinstance(description, dict) and description.get("class") == "SpecStr"
+        kwargs = description.get("kwargs", {}) if is_str else {}
+        strings = kwargs.get("allowed_strings") if is_str else None
+        # allowed strings with new lines can't be kept one per line
+        if (strings is not None and len(strings) > file_threshold and set(kwargs) <= {"allowed_strings", "allowed_chars", "to_lower", "extra_values"}
+                and not any([isinstance(item, str) and "\n" in item for item in strings])):
+            path = os.path.abspath("{}.{}.vocab".format(cache_path, len(files)))
+            temporary = _temporary_path(path)
+            write_vocabulary(strings, temporary, kwargs.get("to_lower", True))
+            os.replace(temporary, path)
+            files.append([path, _file_stamp(path)])
+            specs[name] = SpecStrFile(path, kwargs.get("to_lower", True), kwargs.get("extra_values"))
+        else:
+            specs[name] = _spec_from_json(description, specs, _CACHE_CLASSES)
+
+    import pickle
+
+    temporary = _temporary_path(cache_path)
+    with open(temporary, "wb") as file:
+        file.write(json.dumps({"version": _CACHE_VERSION, "key": key, "files": files}).encode() + b"\n")
+        pickle.dump(specs, file, pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, cache_path)
+
+    return specs
+
+# the most bytes a line of JSON sent to or from a 'ValidationServer' can be by default
+_MAX_LINE = 1 << 26
+
+async def _read_line(reader):
+    """
+    Private method which returns the next line from 'reader', b'' at the end or None if the line is longer than the limit of 'reader', skipping it
+    """
+
+    try:
+        return await reader.readuntil(b"\n")
+    except _asyncio.IncompleteReadError as error:
+        return error.partial
+    except _asyncio.LimitOverrunError as error:
+        consumed = error.consumed
+
+    while True:
+        await reader.readexactly(consumed)
+        try:
+            await reader.readuntil(b"\n")
+            return None
+        except _asyncio.IncompleteReadError:
+            return None
+        except _asyncio.LimitOverrunError as error:
+            consumed = error.consumed
+
+class ValidationServer:
+    """
+    Validates values sent as lines of JSON over a unix socket or TCP with specifications registered by name.
+    Values from every connection which arrive while a batch is being validated are validated together in the next batch.
+    Use 'start' to start listening and 'close' afterwards to stop validating
+
+    Each request is a JSON object on one line with an 'id' which is sent back with its reply, and an 'op' of:
+        - 'validate' (the default): 'spec' is the name of the specification and 'value' the value. Replies with 'valid' and the validated 'value'
+        - 'validate_many': 'spec' is the name of the specification and 'values' a list of values. Replies with 'results', a list of whether or not each is valid and the validated value
+        - 'register': 'name' is the name to register the specification as and 'spec' a dictionary of its 'class' name and the keyword parameters 'kwargs' to make it with.
+            The fields of a 'SpecRecord' and the specifications combined by a 'SpecAll', 'SpecAny' or 'SpecNot' are the names of registered specifications. Replies with 'registered', the name
+    Invalid requests are replied to with 'error', a message. Requests longer than 'max_line' are replied to with an 'error' and an 'id' of None as they aren't read
+
+    :param specs: A dictionary of names to descendants of the 'Spec' class to register at the start. Default: None
+    :param max_batch: The most values to validate in one batch. Default: 10000
+    :param max_line: The most bytes a request can be. Default: 67108864
+    """
+
+    def __init__(self, specs=None, max_batch=10000, max_line=_MAX_LINE):
+        """
+        Validates values sent as lines of JSON over a unix socket or TCP with specifications registered by name
+
+        :param specs: A dictionary of names to descendants of the 'Spec' class to register at the start. Default: None
+        :param max_batch: The most values to validate in one batch. Default: 10000
+        :param max_line: The most bytes a request can be. Default: 67108864
+        """
+
+        assert specs is None or isinstance(specs, dict) and all([isinstance(spec, Spec) for spec in specs.values()]), "param specs must be a dictionary of 'Spec' objects or None"
+        assert isinstance(max_batch, int) and max_batch > 0, "param max_batch must be a positive integer"
+        assert isinstance(max_line, int) and max_line > 0, "param max_line must be a positive integer"
+
+        self.specs = dict(specs or {})
+        self.max_batch = max_batch
+        self.max_line = max_line
+        self._queue = None
+        self._batcher = None
+
+    async def start(self, path=None, host="127.0.0.1", port=0):
+        """
+        Start listening for connections on a unix socket if 'path' is given, otherwise on TCP
+
+        :param path: The path of the unix socket. None uses TCP. Default: None
+        :param host: The host to listen on for TCP. Default: '127.0.0.1'
+        :param port: The port to listen on for TCP. 0 uses any free port. Default: 0
+        :return: The 'asyncio.Server', whose 'sockets' give the address it is listening on
+        """
+
+        _import_asyncio()
+        self._queue = _asyncio.Queue()
+        self._batcher = _asyncio.ensure_future(self._validate_batches())
+
+        if path is not None:
+            return await _asyncio.start_unix_server(self._serve_connection, path, limit=self.max_line)
+
+        return await _asyncio.start_server(self._serve_connection, host, port, limit=self.max_line)
+
+    async def _validate_batches(self):
+        # waits for a request then validates it along with every other one which has arrived since, with the values for each specification together
+        while True:
+            batch = [await self._queue.get()]
+            size = len(batch[0][1])
+            while size < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                size += len(batch[-1][1])
+
+            by_spec = {}
+            for spec, values, future in batch:
+                by_spec.setdefault(spec, []).append((values, future))
+
+            for spec, requests in by_spec.items():
+                validator = spec.compile()
+                try:
+                    results = [validator(value) for values, future in requests for value in values]
+                except Exception:
+                    # validates each request on its own so only the one with the value that caused the error gets it
+                    for values, future in requests:
+                        if future.cancelled():
+                            continue
+                        try:
+                            future.set_result([validator(value) for value in values])
+                        except Exception as error:
+                            future.set_exception(error)
+                    continue
+
+                start = 0
+                for values, future in requests:
+                    if not future.cancelled():
+                        future.set_result(results[start:start + len(values)])
+                    start += len(values)
+
+            # lets the connections read more requests before the next batch
+            await _asyncio.sleep(0)
+
+    async def close(self):
+        """
+        Stop validating, cancelling the requests still waiting to be validated. The 'asyncio.Server' returned by 'start' is closed separately
+        """
+
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except _asyncio.CancelledError:
+                pass
+            self._batcher = None
+
+        while self._queue is not None and not self._queue.empty():
+            self._queue.get_nowait()[2].cancel()
+
+    async def _validate(self, name, values):
+        if name not in self.specs:
+            raise KeyError("no specification registered as '{}'".format(name))
+
+        future = _asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((self.specs[name], values, future))
+
+        return await future
+
+    async def _reply(self, line, writer):
+        request = {}
+        try:
+            request = json.loads(line)
+            op = request.get("op", "validate")
+            if op == "validate":
+                valid, value = (await self._validate(request["spec"], [request["value"]]))[0]
+                reply = {"valid": valid, "value": value}
+            elif op == "validate_many":
+                reply = {"results": await self._validate(request["spec"], list(request["values"]))}
+            elif op == "register":
+                self.specs[request["name"]] = _spec_from_json(request["spec"], self.specs)
+                reply = {"registered": request["name"]}
+            else:
+                reply = {"error": "unknown op '{}'".format(op)}
+        except Exception as error:
+            reply = {"error": "{}: {}".format(type(error).__name__, error)}
+
+        reply["id"] = request.get("id") if isinstance(request, dict) else None
+        writer.write(json.dumps(reply).encode() + b"\n")
+
+    async def _serve_connection(self, reader, writer):
+        # requests are answered as soon as they are validated so one connection can send many without waiting for replies
+        replies = set()
+        try:
+            while True:
+                line = await _read_line(reader)
+                if line is None:
+                    writer.write(json.dumps({"error": "request longer than {} bytes".format(self.max_line), "id": None}).encode() + b"\n")
+                    continue
+                if not line:
+                    break
+                reply = _asyncio.ensure_future(self._reply(line, writer))
+                replies.add(reply)
+                reply.add_done_callback(replies.discard)
+                await writer.drain()
+            if replies:
+                await _asyncio.wait(replies)
+        finally:
+            writer.close()
+
+class ValidationClient:
+    """
+    Sends values to a 'ValidationServer' to validate, over a pool of connections which can each have many requests waiting for replies at once.
+    Use 'connect' before sending anything and 'close' afterwards, or use it with 'async with'
+
+    :param path: The path of the unix socket of the server. None uses TCP. Default: None
+    :param host: The host of the server for TCP. Default: '127.0.0.1'
+    :param port: The port of the server for TCP. Default: None
+    :param connections: The number of connections to make to the server. Default: 4
+    :param max_line: The most bytes a request or reply can be, which should match the server's. Default: 67108864
+    """
+
+    def __init__(self, path=None, host="127.0.0.1", port=None, connections=4, max_line=_MAX_LINE):
+        """
+        Sends values to a 'ValidationServer' to validate, over a pool of connections which can each have many requests waiting for replies at once
+
+        :param path: The path of the unix socket of the server. None uses TCP. Default: None
+        :param host: The host of the server for TCP. Default: '127.0.0.1'
+        :param port: The port of the server for TCP. Default: None
+        :param connections: The number of connections to make to the server. Default: 4
+        :param max_line: The most bytes a request or reply can be, which should match the server's. Default: 67108864
+        """
+
+        assert path is not None or port is not None, "one of params path or port must be given"
+        assert isinstance(connections, int) and connections > 0, "param connections must be a positive integer"
+        assert isinstance(max_line, int) and max_line > 0, "param max_line must be a positive integer"
+
+        self.path = path
+        self.host = host
+        self.port = port
+        self.connections = connections
+        self.max_line = max_line
+        # a writer, the task reading its replies and a dictionary of the id of each request waiting for a reply to its future, for each connection
+        self._pool = []
+        self._ids = itertools.count()
+
+    async def connect(self):
+        """
+        Make the connections to the server
+        """
+
+        _import_asyncio()
+        for _ in range(self.connections):
+            if self.path is not None:
+                reader, writer = await _asyncio.open_unix_connection(self.path, limit=self.max_line)
+            else:
+                reader, writer = await _asyncio.open_connection(self.host, self.port, limit=self.max_line)
+            waiting = {}
+            self._pool.append((writer, _asyncio.ensure_future(self._read_replies(reader, waiting)), waiting))
+
+        return self
+
+    async def close(self):
+        """
+        Close the connections to the server
+        """
+
+        for writer, reading, waiting in self._pool:
+            writer.close()
+            reading.cancel()
+        for writer, reading, waiting in self._pool:
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+        self._pool = []
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _read_replies(self, reader, waiting):
+        error = ConnectionError("connection to the validation server closed")
+        try:
+            while True:
+                line = await _read_line(reader)
+                if line is None:
+                    # which request it replies to isn't known, so none of those waiting on this connection can be replied to
+                    error = ValueError("reply longer than {} bytes".format(self.max_line))
+                    break
+                if not line:
+                    break
+                reply = json.loads(line)
+                future = waiting.pop(reply.pop("id"), None)
+                if future is not None and not future.cancelled():
+                    future.set_result(reply)
+        except Exception as exception:
+            error = exception
+        finally:
+            # nothing still waiting on this connection will be replied to, and nothing more is sent on it
+            for future in waiting.values():
+                if not future.done():
+                    future.set_exception(error)
+            waiting.clear()
+
+    async def _request(self, request):
+        assert self._pool, "must connect before sending requests"
+
+        request["id"] = id_ = next(self._ids)
+        line = json.dumps(request).encode() + b"\n"
+        if len(line) > self.max_line:
+            raise ValueError("request longer than {} bytes".format(self.max_line))
+
+        connections = [connection for connection in self._pool if not connection[1].done()]
+        if not connections:
+            raise ConnectionError("every connection to the validation server is closed")
+        writer, reading, waiting = connections[id_ % len(connections)]
+
+        future = _asyncio.get_running_loop().create_future()
+        waiting[id_] = future
+        writer.write(line)
+        await writer.drain()
+
+        reply = await future
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+
+        return reply
+
+    async def is_valid(self, spec, value):
+        """
+        Return whether or not 'value' is valid according to the specification registered as 'spec' and the validated 'value'
+
+        :param spec: The name of the specification on the server
+        :param value: The value to validate, which must be able to be converted to JSON
+        :return: The same as 'is_valid'
+        """
+
+        reply = await self._request({"op": "validate", "spec": spec, "value": value})
+
+        return reply["valid"], reply["value"]
+
+    async def validate_many(self, spec, values):
+        """
+        Return whether or not each of 'values' is valid according to the specification registered as 'spec' and the validated value
+
+        :param spec: The name of the specification on the server
+        :param values: A list of the values to validate, which must be able to be converted to JSON
+        :return: A list of the same as 'is_valid' for each value, in the same order as 'values'
+        """
+
+        reply = await self._request({"op": "validate_many", "spec": spec, "values": list(values)})
+
+        return [tuple(result) for result in reply["results"]]
+
+    async def register(self, name, class_name, **kwargs):
+        """
+        Register a specification with the server as 'name'
+
+        :param name: The name to register the specification as
+        :param class_name: The name of the specification class, such as 'SpecStr'. The fields of a 'SpecRecord' and the specifications combined by a 'SpecAll', 'SpecAny' or 'SpecNot' are the names of registered specifications
+        :param kwargs: The keyword parameters to make the specification with
+        """
+
+        await self._request({"op": "register", "name": name, "spec": {"class": class_name, "kwargs": kwargs}})
 
 specTrueFalse = SpecStr(["t", "true", "f", "false", "y", "yes", "n", "no", "0", "1", "on", "off", "enabled", "enable", "disabled", "disable"])
 specDay = SpecNumRange(1, 31, restrict_to_int=True)
@@ -466,3 +3211,100 @@ specMonth = SpecNumRange(1, 12, restrict_to_int=True)
 specYear = SpecNumRange(1, restrict_to_int=True)
 specHour = SpecNumRange(0, 23, restrict_to_int=True)
 specMinuteSecond = SpecNumRange(0, 59, restrict_to_int=True)
+
+# the validators used to check dates and times without asking for input
+_validate_whole_number = SpecNum.shared(None, True).compile()
+_validate_period = SpecStr.shared(["am", "pm"]).compile()
+_validate_seconds = SpecNumRange.shared(0, 59, 0, True).compile()
+_validate_milli_seconds = SpecNumRange.shared(0, 59.999999, 6, False).compile()
+
+def _load_specs(location):
+    """
+    Private method which returns the dictionary of specifications at 'location', written as module:attribute
+    """
+
+    module, _, attribute = location.partition(":")
+
+    return getattr(importlib.import_module(module), attribute)
+
+async def _serve(path, host, port, specs):
+    """
+    Private method which runs a 'ValidationServer' until it is stopped
+    """
+
+    validation_server = ValidationServer(specs)
+    server = await validation_server.start(path, host, port)
+    print("Validating on", ", ".join([str(sock.getsockname()) for sock in server.sockets]), flush=True)
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await validation_server.close()
+
+def main(args=None):
+    """
+    Run a command given on the command line, as used by 'python -m Validation':
+        - 'serve': run a 'ValidationServer' on a unix socket with --socket PATH or on TCP with --host and --port,
+            with the specifications of any number of --specs module:attribute, where the attribute is a dictionary of names to specifications,
+            and of any number of --spec-file FILE, a JSON file of descriptions of specifications which are cached by 'cached_specs' in FILE.cache
+        - 'bench': run the benchmarks, writing the results as JSON to --output or printing them, and with --compare BASELINE,
+            list the benchmarks slower than the results in BASELINE by more than --threshold and exit with status 1 if there are any
+
+    :param args: The command line arguments. None uses those given to the program. Default: None
+    """
+
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m Validation", description="Tools for validating inputs or variables according to specifications")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="validate values sent as lines of JSON over a unix socket or TCP")
+    serve.add_argument("--socket", help="path of the unix socket to listen on, otherwise TCP is used")
+    serve.add_argument("--host", default="127.0.0.1", help="host to listen on for TCP. Default: 127.0.0.1")
+    serve.add_argument("--port", type=int, default=0, help="port to listen on for TCP. Default: any free port")
+    serve.add_argument("--specs", action="append", default=[], help="module:attribute of a dictionary of names to specifications to register, can be given more than once")
+    serve.add_argument("--spec-file", action="append", default=[], help="JSON file of names to descriptions of specifications to register, cached in the same file with .cache added, can be given more than once")
+
+    bench = commands.add_parser("bench", help="time validating with every specification and function")
+    bench.add_argument("--output", help="file to write the results to as JSON, otherwise they are printed")
+    bench.add_argument("--compare", help="file of earlier results to compare with, exiting with status 1 if any benchmark is slower")
+    bench.add_argument("--threshold", type=float, default=0.1, help="fraction slower a benchmark must be to count as slower. Default: 0.1")
+    bench.add_argument("--repeat", type=int, default=5, help="number of times to time each benchmark. Default: 5")
+    bench.add_argument("names", nargs="*", help="only run benchmarks whose names contain one of these")
+
+    args = parser.parse_args(args)
+
+    if args.command == "serve":
+        specs = {}
+        for location in args.specs:
+            specs.update(_load_specs(location))
+        for path in args.spec_file:
+            specs.update(cached_specs(path, path + ".cache"))
+        try:
+            _import_asyncio().run(_serve(args.socket, args.host, args.port, specs))
+        except KeyboardInterrupt:
+            pass
+
+    elif args.command == "bench":
+        from ValidationBenchmarks import run_benchmarks, compare_benchmarks
+
+        results = run_benchmarks(args.names or None, args.repeat)
+        if args.output is not None:
+            with open(args.output, "w") as file:
+                json.dump(results, file, indent=4)
+        else:
+            print(json.dumps(results, indent=4))
+
+        if args.compare is not None:
+            with open(args.compare) as file:
+                slower = compare_benchmarks(results, json.load(file), args.threshold)
+            for name, result in slower.items():
+                print("SLOWER {}: {:.0f}/s, was {:.0f}/s ({:.1%})".format(name, result["per_second"], result["baseline"], result["changed"]), file=sys.stderr)
+            if slower:
+                sys.exit(1)
+
+if __name__ == "__main__":
+    # run from the imported module rather than __main__ so specifications made by other modules are of the same classes
+    import Validation
+    Validation.main()
@@ -0,0 +1,168 @@
+"""
+Benchmarks of validating with every specification and function in 'Validation', run by 'python -m Validation bench'
+"""
+
+import os
+import platform
+import random
+import string
+import tempfile
+from time import perf_counter
+
+from Validation import (
+    Spec, SpecStr, SpecStrFile, SpecNum, SpecNumRange, SpecNumList, SpecRecord, SpecAll, SpecAny, SpecNot,
+    is_valid, assert_valid, validate_record, is_valid_date, parse_dates, parse_times, is_valid_array, is_valid_buffer, write_vocabulary,
+)
+
+__all__ = ["run_benchmarks", "compare_benchmarks"]
+
+def _benchmarks(directory):
+    """
+    Private method which returns a dictionary of the name of each benchmark to a function which runs it once and the number of values it validates each time
+    The values are made from a fixed random seed so every run uses the same ones. Files the benchmarks need are written in 'directory'
+    """
+
+    generator = random.Random(0)
+    words = ["".join(generator.choice(string.ascii_lowercase) for _ in range(8)) for _ in range(10000)]
+    small_words = words[:10]
+    numbers = [generator.uniform(-50, 150) for _ in range(1000)]
+    number_strings = [" {} ".format(number) for number in numbers]
+
+    def mixed(valid, invalid, valid_ratio):
+        return [generator.choice(valid) if generator.random() < valid_ratio else generator.choice(invalid) for _ in range(1000)]
+
+    def run_each(spec, values):
+        validator = spec.compile()
+        return (lambda: [validator(value) for value in values]), len(values)
+
+    def run_function(function, values, *args):
+        return (lambda: [function(value, *args) for value in values]), len(values)
+
+    def construct(cls, *args, **kwargs):
+        return (lambda: [cls(*args, **kwargs) for _ in range(100)]), 100
+
+    spec_str_small = SpecStr(small_words)
+    spec_str_large = SpecStr(words)
+    spec_chars = SpecStr(allowed_chars=list(string.ascii_lowercase + " "))
+    spec_num = SpecNum(2)
+    spec_range = SpecNumRange(0, 100, restrict_to_int=True)
+    spec_list = SpecNumList(list(range(0, 1000, 7)), restrict_to_int=True)
+    record_fields = {"field_{}".format(number): spec_range if number % 2 else spec_str_small for number in range(20)}
+    spec_record = SpecRecord(record_fields)
+    records = [{name: (str(generator.randint(-10, 110)) if number % 2 else generator.choice(small_words + ["nope"])) for number, name in enumerate(record_fields)} for _ in range(200)]
+    texts = [" ".join(generator.choice(small_words) for _ in range(20)) for _ in range(200)]
+    vocabulary = os.path.join(directory, "words.txt")
+    write_vocabulary(words, vocabulary)
+    spec_str_file = SpecStrFile(vocabulary)
+    dates = ["{}-{}-{}".format(generator.randint(1900, 2100), generator.randint(1, 12), generator.randint(1, 31)) for _ in range(1000)]
+
+    benchmarks = {
+        "construct Spec": construct(Spec, int),
+        "construct SpecStr small": construct(SpecStr, small_words),
+        "construct SpecStr large": construct(SpecStr, words),
+        "construct SpecNumRange": construct(SpecNumRange, 0, 100, None, True, [""]),
+        "construct SpecNumList": construct(SpecNumList, list(range(100))),
+        "construct SpecNumRange shared": ((lambda: [SpecNumRange.shared(0, 100, None, True, [""]) for _ in range(100)]), 100),
+        "construct SpecRecord": construct(SpecRecord, record_fields),
+        "construct SpecStrFile": construct(SpecStrFile, vocabulary),
+        "construct SpecNot": construct(SpecNot, spec_range),
+        "is_valid Spec int": run_function(is_valid, number_strings, Spec(int)),
+        "is_valid SpecStr small all valid": run_function(is_valid, mixed(small_words, words, 1), spec_str_small),
+        "is_valid SpecStr small half valid": run_function(is_valid, mixed(small_words, words, 0.5), spec_str_small),
+        "is_valid SpecStr large all valid": run_function(is_valid, mixed(words, small_words, 1), spec_str_large),
+        "is_valid SpecStr large half valid": run_function(is_valid, mixed(words, ["nope", "NOPE "], 0.5), spec_str_large),
+        "is_valid SpecStr allowed_chars": run_function(is_valid, texts, spec_chars),
+        "is_valid SpecStrFile all valid": run_function(is_valid, mixed(words, small_words, 1), spec_str_file),
+        "is_valid SpecStrFile half valid": run_function(is_valid, mixed(words, ["nope", "NOPE "], 0.5), spec_str_file),
+        "is_valid SpecNum numbers": run_function(is_valid, numbers, spec_num),
+        "is_valid SpecNum strings": run_function(is_valid, number_strings, spec_num),
+        "is_valid SpecNumRange numbers": run_function(is_valid, [int(number) for number in numbers], spec_range),
+        "is_valid SpecNumRange strings": run_function(is_valid, [str(int(number)) for number in numbers], spec_range),
+        "is_valid SpecNumRange not numbers": run_function(is_valid, small_words * 100, spec_range),
+        "is_valid SpecNumList": run_function(is_valid, [str(generator.randint(0, 1000)) for _ in range(1000)], spec_list),
+        "is_valid SpecRecord": run_function(is_valid, records, spec_record),
+        "is_valid SpecNumRange strings cached": run_function(is_valid, [str(generator.randint(-10, 110)) for _ in range(1000)], SpecNumRange.shared(0, 100, None, True).cache_results()),
+        "is_valid SpecAny range or sentinel": run_function(is_valid, mixed([str(number) for number in range(101)], ["n/a", "unknown", "-5"], 0.8), SpecAny([spec_range, SpecStr(["n/a", "unknown"])])),
+        "is_valid SpecAll chars and list": run_function(is_valid, mixed(small_words, texts, 0.5), SpecAll([spec_chars, spec_str_small])),
+        "is_valid SpecNot list": run_function(is_valid, mixed(small_words, words, 0.5), SpecNot(spec_str_small)),
+        "is_valid SpecNot range": run_function(is_valid, [str(int(number)) for number in numbers], SpecNot(spec_range)),
+        "compiled SpecNumRange strings": run_each(spec_range, [str(int(number)) for number in numbers]),
+        "assert_valid SpecNumRange": run_function(assert_valid, [str(generator.randint(0, 100)) for _ in range(1000)], spec_range),
+        "validate_record collect all": run_function(validate_record, records, spec_record),
+        "validate_record fail fast": run_function(validate_record, records, spec_record, True),
+        "is_valid_date": ((lambda: [is_valid_date(*date_.split("-")) for date_ in dates]), len(dates)),
+        "parse_dates long": ((lambda: parse_dates(dates, "long")), len(dates)),
+        "parse_times": ((lambda: parse_times(["{}:{}:{}".format(number % 24, number % 60, number % 61) for number in range(1000)])), 1000),
+    }
+
+    try:
+        import numpy
+    except ImportError:
+        pass
+    else:
+        array = numpy.array(numbers * 100)
+        benchmarks["is_valid_array SpecNumRange"] = (lambda: is_valid_array(array, SpecNumRange.shared(0, 100, 2))), len(array)
+        buffer = array.tobytes()
+        benchmarks["is_valid_buffer SpecNumRange"] = (lambda: is_valid_buffer(buffer, SpecNumRange.shared(0, 100, 2), "float64", chunk_size=16384)), len(array)
+
+    return benchmarks
+
+def run_benchmarks(names=None, repeat=5, min_time=0.1):
+    """
+    Run the benchmarks of every specification and function and return how many values each validated per second
+
+    :param names: A list of parts of benchmark names, only running the benchmarks whose names contain one of them. None runs all of them. Default: None
+    :param repeat: The number of times to time each benchmark, using the fastest. Default: 5
+    :param min_time: The fewest seconds to run each benchmark for each time it is timed. Default: 0.1
+    :return: A dictionary which can be converted to JSON of 'python', the version of Python, and 'results', a dictionary of each benchmark's name to a dictionary of 'per_second', the values validated per second
+    """
+
+    assert isinstance(repeat, int) and repeat > 0, "param repeat must be a positive integer"
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (benchmark, size) in _benchmarks(directory).items():
+            if names is not None and not any([part in name for part in names]):
+                continue
+
+            # runs it enough times to take at least min_time then times that many runs repeatedly
+            runs = 1
+            while True:
+                start = perf_counter()
+                for _ in range(runs):
+                    benchmark()
+                seconds = perf_counter() - start
+                if seconds >= min_time:
+                    break
+                runs *= 2
+
+            for _ in range(repeat - 1):
+                start = perf_counter()
+                for _ in range(runs):
+                    benchmark()
+                seconds = min(seconds, perf_counter() - start)
+
+            results[name] = {"per_second": runs * size / seconds}
+
+    return {"python": platform.python_version(), "results": results}
+
+def compare_benchmarks(results, baseline, threshold=0.1):
+    """
+    Return the benchmarks which are slower in 'results' than in 'baseline' by more than 'threshold'
+
+    :param results: The results of 'run_benchmarks'
+    :param baseline: Earlier results of 'run_benchmarks' to compare with
+    :param threshold: The fraction slower a benchmark must be to be returned. Default: 0.1
+    :return: A dictionary of the name of each slower benchmark to a dictionary of its 'baseline' and current 'per_second' and the fraction it 'changed' by, which is negative
+    """
+
+    slower = {}
+    for name, result in results["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before = baseline["results"][name]["per_second"]
+        changed = result["per_second"] / before - 1
+        if changed < -threshold:
+            slower[name] = {"baseline": before, "per_second": result["per_second"], "changed": changed}
+
+    return slower
@@ -0,0 +1,758 @@
+import array
+import asyncio
+import datetime
+import decimal
+import io
+import itertools
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+
+import pytest
+
+import Validation
+from Validation import (
+    PrefixValidator, Spec, SpecAll, SpecAny, SpecNot, SpecNum, SpecNumList, SpecNumRange, SpecRecord, SpecStr, SpecStrFile, ValidationClient, ValidationServer,
+    assert_valid, cached_specs, disable_instrumentation, enable_instrumentation, instrumentation_prometheus, instrumentation_snapshot, is_valid, is_valid_array,
+    is_valid_buffer, is_valid_date, is_valid_datetime, is_valid_time, parse_dates, parse_datetimes, parse_times, reset_instrumentation, validate_many,
+    validate_record, validate_stream, write_vocabulary,
+)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def reference_is_valid(value, spec):
+    """
+    'is_valid' as it was before specifications were compiled, which the compiled validators must give the same results as
+    """
+
+    if spec.extra_values and value in spec.extra_values:
+        return True, value
+
+    if isinstance(value, str):
+        value = value.strip()
+
+    if isinstance(spec, SpecNum):
+        try:
+            value = float(value)
+        except (ValueError, TypeError):
+            return False, value
+        else:
+            if spec.round_digits is not None:
+                value = Validation._round(value, spec.round_digits)
+
+    try:
+        value = spec.type(value)
+    except ValueError:
+        return False, value
+    else:
+        if isinstance(spec, SpecStr) and spec.to_lower:
+            value = value.lower()
+        if isinstance(spec, SpecNum) and spec.round_digits is not None:
+            value = Validation._round(value, spec.round_digits)
+
+        if getattr(spec, "allowed_strings", None) is not None:
+            return value in spec.allowed_strings, value
+
+        if getattr(spec, "list_of_allowed", None) is not None:
+            return value in spec.list_of_allowed, value
+
+        if getattr(spec, "allowed_chars", None) is not None:
+            return all([char in spec.allowed_chars for char in value]), value
+
+        if isinstance(spec, SpecNumRange):
+            if spec.min is not None and spec.max is not None:
+                return spec.min <= value <= spec.max, value
+            if spec.min is not None:
+                return spec.min <= value, value
+            if spec.max is not None:
+                return value <= spec.max, value
+
+    return True, value
+
+def outcome(function, value, spec):
+    # the result, or the type of exception raised, in a form which can be compared, counting any nan as the same
+    try:
+        valid, value = function(value, spec)
+    except Exception as error:
+        return "raised", type(error)
+    if isinstance(value, float) and math.isnan(value):
+        return valid, "nan", float
+
+    return valid, repr(value), type(value)
+
+def make_specs():
+    return [
+        Spec(int), Spec(float, ["", None]), Spec(str),
+        SpecStr(), SpecStr(to_lower=False), SpecStr(["Ab", "cd", "EF"]), SpecStr(["Ab", "cd"], to_lower=False, extra_values=[""]),
+        SpecStr(allowed_chars=list("abcXYZ ")), SpecStr(allowed_chars=list("abcXYZ"), to_lower=False),
+        SpecNum(), SpecNum(2), SpecNum(0), SpecNum(-1), SpecNum(None, True), SpecNum(0, True), SpecNum(2, True, [""]), SpecNum(-1, True),
+        SpecNumRange(1, 31, restrict_to_int=True), SpecNumRange(0, 59.999999, 6), SpecNumRange(1, restrict_to_int=True), SpecNumRange(max_=10.5),
+        SpecNumRange(), SpecNumRange(-5, 5, 1, extra_values=["x", ""]),
+        SpecNumList([12, 24], None, True), SpecNumList([1.5, 2.25, 3], 2), SpecNumList([1, 2, 3], 0), SpecNumList([0.1, 0.2]),
+    ]
+
+def make_values():
+    generator = random.Random(0)
+    values = ["", " ", "1", " 12 ", "24", "1.5", "2.25", "2.249", "abc", "ABC", " Ab ", "cd", "X Y", "nan", "inf", "-inf", "1e400", "1_000", "0x1",
+              None, [], [1], 1, 12, 24, 0, -3, 1.5, 2.249999, 0.1, 0.2, 0.30000000000000004, 59.9999995, True, False, "x", "\t5\n", "Ab", "ef", "é"]
+    values += [generator.uniform(-100, 100) for _ in range(100)] + [str(generator.uniform(-100, 100)) for _ in range(100)] + [generator.randint(-40, 40) for _ in range(50)]
+
+    return values
+
+@pytest.mark.parametrize("spec", make_specs(), ids=repr)
+def test_compiled_matches_reference(spec):
+    validator = spec.compile()
+    for value in make_values():
+        expected = outcome(reference_is_valid, value, spec)
+        assert outcome(is_valid, value, spec) == expected, value
+        assert outcome(lambda value, spec: validator(value), value, spec) == expected, value
+
+def test_lists_changed_in_place_recompile():
+    spec = SpecStr(["a"])
+    assert is_valid("b", spec)[0] is False
+    spec.allowed_strings.append("b")
+    assert is_valid("b", spec) == (True, "b")
+
+    spec = SpecNumList([1, 2], restrict_to_int=True)
+    is_valid(3, spec)
+    spec.list_of_allowed += [3]
+    assert is_valid(3, spec) == (True, 3)
+
+def test_allowed_chars_lowering_to_several_chars():
+    # 'İ' lowers to 'i' and a combining dot, so it never matched the lowered value one character at a time
+    spec = SpecStr(allowed_chars=["İ", "a"])
+
+    assert is_valid("i", spec) == reference_is_valid("i", spec) == (False, "i")
+    assert is_valid("a", spec) == (True, "a")
+
+def number_values():
+    generator = random.Random(1)
+    values = [generator.uniform(-150, 150) for _ in range(500)] + [float(generator.randint(-150, 150)) for _ in range(500)]
+    values += [0.5, 1.5, 2.5, -0.5, 2.0 ** 53 + 1, -2.0 ** 60, 1e300, float("inf"), float("-inf"), float("nan")]
+
+    return values
+
+ARRAY_SPECS = [
+    SpecNum(), SpecNum(2), SpecNum(0, True), SpecNum(None, True),
+    SpecNumRange(0, 100), SpecNumRange(0, 100, 2), SpecNumRange(-10, 10, restrict_to_int=True), SpecNumRange(min_=0, restrict_to_int=True),
+    SpecNumRange(max_=3.5, extra_values=[1e300]), SpecNumList([1, 2, 3, 50], restrict_to_int=True), SpecNumList([0.5, 1.5], 1),
+]
+
+def expected_elementwise(values, spec):
+    # infinity and nan can't be converted to an integer, which arrays and buffers count as invalid
+    results = []
+    for value in values:
+        try:
+            results.append(is_valid(value, spec))
+        except (OverflowError, ValueError):
+            results.append((False, value))
+
+    return results
+
+@pytest.mark.parametrize("spec", ARRAY_SPECS, ids=repr)
+def test_is_valid_array_matches_is_valid(spec):
+    np = pytest.importorskip("numpy")
+    values = number_values()
+
+    valid, validated = is_valid_array(np.array(values), spec)
+
+    for index, (expected_valid, expected_value) in enumerate(expected_elementwise(values, spec)):
+        assert valid[index] == expected_valid, values[index]
+        if expected_valid:
+            assert validated[index] == expected_value or math.isnan(expected_value) and math.isnan(validated[index]), values[index]
+
+def test_import_is_lazy():
+    script = "import sys, Validation; print(sorted(name for name in ['numpy', 'asyncio', 'argparse', 'concurrent.futures'] if name in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", script], cwd=HERE, capture_output=True, text=True, check=True).stdout
+
+    assert output.strip() == "[]"
+
+def test_star_import_only_exports_the_api():
+    namespace = {"np": "numpy"}
+    exec("from Validation import *", namespace)
+
+    assert namespace["np"] == "numpy"
+    assert set(namespace) - {"np", "__builtins__"} == set(Validation.__all__)
+    assert not {"os", "re", "sys", "json", "csv", "asyncio"} & set(namespace)
+
+def test_validate_stream_invalid_json_lines():
+    file = io.StringIO('{"a": "1"}\n{bad\n[1, 2]\n\n{"a": "x"}\n')
+    spec = SpecNumRange(0, 9, restrict_to_int=True)
+
+    rows = list(validate_stream(file, {"a": spec}, form="jsonl"))
+
+    assert [row[0] for row in rows] == [1, 2, 3, 4]
+    assert rows[0][1:] == ({"a": 1}, {})
+    assert rows[1][1] == "{bad" and list(rows[1][2]) == [None]
+    assert rows[2][1:] == ("[1, 2]", {None: "Not a JSON object"})
+    assert rows[3][2] == {"a": spec.msg}
+
+    file.seek(0)
+    summary = list(validate_stream(file, {"a": spec}, form="jsonl", summary=True))[-1]
+    assert summary["failures"] == {"a": 1, None: 2}
+
+def test_validate_stream_csv():
+    file = io.StringIO("name,age\nAnn, 5\nBob,500\nCat,inf\nDan\nEve,7\n")
+    spec = SpecNumRange(0, 130, restrict_to_int=True)
+
+    rows = list(validate_stream(file, {"age": spec, "name": SpecStr()}, chunk_size=2, form="csv"))
+
+    assert rows[0] == (1, {"name": "ann", "age": 5}, {})
+    assert rows[1][2] == {"age": spec.msg}
+    # a value which makes the specification raise is an error of its row rather than ending the stream
+    assert rows[2][2] == {"age": "OverflowError: cannot convert float infinity to integer"}
+    assert rows[3][2] == {"age": "Missing"}
+    assert rows[4] == (5, {"name": "eve", "age": 7}, {})
+
+    file.seek(0)
+    summary = list(validate_stream(file, {"age": spec}, chunk_size=2, form="csv", summary=True))
+    assert len(summary) == 3
+    assert summary[-1]["rows"] == 5 and summary[-1]["invalid_rows"] == 3 and summary[-1]["failures"] == {"age": 3}
+
+def test_validate_stream_path(tmp_path):
+    path = tmp_path / "rows.jsonl"
+    path.write_text('{"age": "4"}\n{"age": "x"}\n', encoding="utf-8")
+
+    assert [row[2] for row in validate_stream(str(path), {"age": SpecNum()})] == [{}, {"age": SpecNum().msg}]
+
+def test_validate_many_matches_is_valid():
+    spec = SpecNumRange(0, 100, 1)
+    values = [str(number / 7) for number in range(-50, 1000)] + ["x", None, 5]
+    expected = [is_valid(value, spec) for value in values]
+
+    assert validate_many(values, spec) == expected
+    # across processes, in order however the chunks are split
+    assert validate_many(iter(values), spec, workers=3, chunksize=100, min_parallel=0) == expected
+
+def test_validate_many_records_across_processes():
+    spec = SpecRecord({"age": SpecNumRange(0, 130, restrict_to_int=True), "code": SpecStr(["gb", "fr"])})
+    values = [{"age": str(number), "code": "GB" if number % 3 else "de"} for number in range(300)]
+
+    assert validate_many(values, spec, workers=2, chunksize=50, min_parallel=0) == [is_valid(value, spec) for value in values]
+
+def test_records_validate_each_field():
+    spec = SpecRecord({"age": SpecNumRange(0, 130, restrict_to_int=True), "name": SpecStr()}, ["name"])
+
+    assert is_valid({"age": " 5 ", "name": " Bob "}, spec) == (True, {"age": 5, "name": "bob"})
+    assert is_valid({"age": "500"}, spec)[0] is False
+    assert validate_record({"age": "x", "name": "a"}, spec)[1] == {"age": spec.fields["age"].msg}
+
+def test_records_match_validating_each_field():
+    generator = random.Random(3)
+    fields = {
+        "range": SpecNumRange(0, 100, restrict_to_int=True), "list": SpecNumList([1, 5, 9], restrict_to_int=True), "float": SpecNumRange(0, 1),
+        "rounded": SpecNum(1), "big": SpecNumRange(0, 10 ** 9, restrict_to_int=True), "word": SpecStr(["Ab", "cd", " ef"]), "exact": SpecStr(["Ab"], to_lower=False),
+        "chars": SpecStr(allowed_chars=list("ab")), "text": SpecStr(), "extra": SpecNumRange(0, 5, restrict_to_int=True, extra_values=["n/a"]), "any": Spec(int),
+    }
+    spec = SpecRecord(fields)
+    values = ["5", " 5 ", 5, 5.0, True, -0.0, "1e2", 100, 101, "x", None, [1], (1,), "Ab", "ab", " AB ", "cd", "ef", " ef", "aab", "", "n/a", 0.5, "0.25", "inf", "nan"]
+
+    for _ in range(1000):
+        record = {name: generator.choice(values) for name in fields}
+        expected, expected_errors = dict(record), {}
+        for name, field in fields.items():
+            try:
+                valid, value = is_valid(record[name], field)
+            except Exception as error:
+                expected_errors[name] = "{}: {}".format(type(error).__name__, error)
+                continue
+            if valid:
+                expected[name] = value
+            else:
+                expected_errors[name] = field.msg
+
+        validated, errors = validate_record(record, spec)
+        assert errors == expected_errors, record
+        assert [(repr(value), type(value)) for value in validated.values()] == [(repr(value), type(value)) for value in expected.values()], record
+        if not any([error.startswith("OverflowError") for error in errors.values()]):
+            assert is_valid(record, spec)[0] == (not errors), record
+
+def test_validate_record_doesnt_raise():
+    spec = SpecRecord({"a": SpecNum(None, True), "b": SpecRecord({"c": SpecNum(None, True)})})
+
+    assert validate_record({"a": "inf", "b": {"c": "-inf"}}, spec)[1] == {
+        "a": "OverflowError: cannot convert float infinity to integer", "b": {"c": "OverflowError: cannot convert float infinity to integer"},
+    }
+
+def test_validate_record_fail_fast_and_tuples():
+    spec = SpecRecord({"x": SpecNumRange(0, 9, restrict_to_int=True), "y": SpecStr(["a"])}, ["y"])
+
+    assert validate_record(("1", "A"), spec) == ((1, "a"), {})
+    assert validate_record({"x": "10", "y": "b"}, spec)[1] == {"x": spec.fields["x"].msg, "y": spec.fields["y"].msg}
+    assert validate_record({"x": "10", "y": "b"}, spec, True)[1] == {"x": spec.fields["x"].msg}
+    assert validate_record({"y": "a"}, spec)[1] == {"x": "Missing"}
+    assert validate_record(5, spec)[1] == {None: spec.msg}
+
+def test_shared_specs_keep_their_own_copies():
+    extra = [""]
+    spec = SpecNumRange.shared(0, 10, None, True, extra)
+    extra.append("x")
+    assert is_valid("x", spec)[0] is False
+    assert SpecNumRange.shared(0, 10, None, True, [""]) is spec
+
+    with pytest.raises(AttributeError):
+        spec.extra_values.append("y")
+    with pytest.raises(AttributeError):
+        spec.max = 20
+
+    fields = {"a": SpecStr()}
+    record = SpecRecord.shared(fields)
+    fields["b"] = SpecStr()
+    assert list(record.fields) == ["a"]
+    with pytest.raises(AttributeError):
+        record.fields["c"] = SpecStr()
+
+def test_subclass_setting_attributes_before_init():
+    class SpecWord(SpecStr):
+        __slots__ = ("word",)
+
+        def __init__(self, word):
+            self.word = word
+            super().__init__([word])
+
+    assert is_valid(" Hi ", SpecWord("hi")) == (True, "hi")
+
+def test_lists_are_copied_when_compiled():
+    strings = ["Am", "pm"]
+    spec = SpecStr(strings)
+    assert spec.msg.endswith("'Am', 'pm'")
+    assert is_valid("AM", spec) == (True, "am")
+
+    strings.append("x")
+    assert is_valid("x", spec)[0] is False
+    spec.allowed_strings.append("x")
+    assert is_valid("x", spec) == (True, "x")
+
+def test_parse_dates_matches_calendar():
+    strings = ["{}-{}-{}".format(year, month, day) for year in (1900, 2000, 2019, 2020) for month in range(0, 14) for day in range(0, 33)]
+    for string, (valid, parsed) in zip(strings, parse_dates(strings)):
+        year, month, day = map(int, string.split("-"))
+        try:
+            expected = datetime.date(year, month, day).isoformat()
+        except ValueError:
+            expected = None
+        assert (valid, parsed) == (expected is not None, expected)
+        assert is_valid_date(year, month, day) == (valid, parsed)
+
+def test_date_and_time_forms():
+    assert parse_dates(["2020-02-29", "2020-feb-03", "3/2/2020"], form="long") == [(True, "29th Feb, 2020"), (True, "3rd Feb, 2020"), (False, None)]
+    assert parse_dates(["3/2/2020"], input_form="uk") == [(True, "2020-02-03")]
+    assert parse_times(["12:05:07 am", "23:59:59", "24:00:00"], output_hour_clock=12) == [(True, "12:05:07 AM"), (True, "11:59:59 PM"), (False, None)]
+    assert parse_times(["7:5:3.25"], milli_seconds=True) == [(True, "07:05:03.25")]
+    assert parse_datetimes(["2020-01-02 13:04:05", "2020-01-02"]) == [(True, "2020-01-02 13:04:05"), (False, None)]
+    assert is_valid_datetime(2020, 1, 2, 1, 4, 5, "PM") == (True, "2020-01-02 13:04:05")
+
+def test_dates_and_times_too_large_arent_valid():
+    assert parse_dates(["2020-01-inf", "inf-01-01", "2020-01-1e400", "2020-nan-01"]) == [(False, None)] * 4
+    assert parse_times(["00:00:inf", "inf:00:00", "00:00:-1e400"]) == [(False, None)] * 3
+    assert parse_times(["00:00:inf"], milli_seconds=True) == [(False, None)]
+    assert parse_datetimes(["2020-01-01 00:00:inf"]) == [(False, None)]
+    assert is_valid_date("2020", "1", "inf") == (False, None)
+    assert is_valid_time("1", "2", float("inf")) == (False, None)
+
+def run_server(test, **server_options):
+    # runs 'test' with a server of a few specifications, failing rather than waiting forever for a reply which never comes
+    async def run():
+        validation_server = ValidationServer({"age": SpecNumRange(0, 130, restrict_to_int=True), "word": SpecStr()}, **server_options)
+        server = await validation_server.start()
+        port = server.sockets[0].getsockname()[1]
+        try:
+            await asyncio.wait_for(test(port), 30)
+        finally:
+            server.close()
+            await server.wait_closed()
+            await validation_server.close()
+
+    asyncio.run(run())
+
+def test_server_round_trip():
+    async def test(port):
+        async with ValidationClient(port=port, connections=2) as client:
+            assert await client.is_valid("age", " 5") == (True, 5)
+            assert await client.is_valid("age", "500") == (False, 500)
+            assert await client.validate_many("word", ["A", " b "]) == [(True, "a"), (True, "b")]
+            await client.register("codes", "SpecStr", allowed_strings=["gb", "fr"])
+            await client.register("row", "SpecRecord", fields={"age": "age", "code": "codes"})
+            assert await client.is_valid("row", {"age": "4", "code": "GB"}) == (True, {"age": 4, "code": "gb"})
+            await client.register("either", "SpecAny", specs=["age", "codes"])
+            assert await client.validate_many("either", ["7", "fr", "de"]) == [(True, 7), (True, "fr"), (False, "de")]
+            with pytest.raises(RuntimeError, match="no specification"):
+                await client.is_valid("missing", 1)
+            results = await asyncio.gather(*[client.is_valid("age", str(number)) for number in range(300)])
+            assert results == [is_valid(str(number), SpecNumRange(0, 130, restrict_to_int=True)) for number in range(300)]
+
+    run_server(test)
+
+def test_server_large_requests_and_replies():
+    async def test(port):
+        async with ValidationClient(port=port) as client:
+            # larger than the 64 KiB asyncio uses by default both ways
+            values = ["word{}".format(number) for number in range(20000)]
+            assert await client.validate_many("word", values) == [(True, value) for value in values]
+
+    run_server(test)
+
+def test_server_request_too_long():
+    async def test(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b'{"id": 1, "spec": "word", "value": "' + b"a" * 5000 + b'"}\n{"id": 2, "spec": "word", "value": "B"}\n')
+        await writer.drain()
+        assert b"longer than" in await reader.readline()
+        assert b'"id": 2' in await reader.readline()
+        writer.close()
+
+        async with ValidationClient(port=port, max_line=1000) as client:
+            with pytest.raises(ValueError):
+                await client.is_valid("word", "a" * 5000)
+            assert await client.is_valid("word", "A") == (True, "a")
+
+    run_server(test, max_line=1000)
+
+def test_client_reply_too_long_only_fails_its_connection():
+    async def test(port):
+        async with ValidationClient(port=port, connections=2, max_line=2000) as client:
+            large, small = await asyncio.gather(client.validate_many("word", ["abcdefgh"] * 150), client.is_valid("word", "B"), return_exceptions=True)
+            assert isinstance(large, ValueError)
+            assert small == (True, "b")
+            # the connection still open takes the requests after
+            assert await client.is_valid("word", "C") == (True, "c")
+            assert await client.is_valid("word", "D") == (True, "d")
+
+    run_server(test)
+
+def test_server_skips_cancelled_requests():
+    async def run():
+        validation_server = ValidationServer({"int": SpecNum(restrict_to_int=True)})
+        server = await validation_server.start()
+        try:
+            # 'inf' makes validating the batch raise, so each request is validated on its own, including the one cancelled while waiting
+            cancelled = asyncio.ensure_future(validation_server._validate("int", ["inf"]))
+            waiting = asyncio.ensure_future(validation_server._validate("int", ["1"]))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            assert await asyncio.wait_for(waiting, 30) == [(True, 1)]
+            assert await asyncio.wait_for(validation_server._validate("int", ["2"]), 30) == [(True, 2)]
+        finally:
+            server.close()
+            await server.wait_closed()
+            await validation_server.close()
+
+        assert validation_server._batcher is None
+        waiting = asyncio.ensure_future(validation_server._validate("int", ["3"]))
+        await asyncio.sleep(0)
+        await validation_server.close()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+    asyncio.run(run())
+
+@pytest.fixture
+def instrumentation():
+    reset_instrumentation()
+    yield
+    disable_instrumentation()
+    reset_instrumentation()
+
+def test_instrumentation_records_each_specification(instrumentation):
+    age = SpecNumRange(0, 130, restrict_to_int=True)
+    word = SpecStr(["a"])
+    enable_instrumentation({"age": age})
+    for value in ["5", "500", " ", "x", 7]:
+        is_valid(value, age)
+    assert_valid("a", word)
+    with pytest.raises(AssertionError):
+        assert_valid(None, word)
+
+    snapshot = instrumentation_snapshot()
+    assert sorted(snapshot) == sorted(["age", repr(word)])
+    assert {key: snapshot["age"][key] for key in ["calls", "passed", "failed", "failures"]} == {"calls": 5, "passed": 2, "failed": 3, "failures": {"str": 2, "blank": 1}}
+    assert snapshot[repr(word)]["failures"] == {"NoneType": 1}
+    assert snapshot["age"]["latency_buckets"]["+Inf"] == 5
+    assert list(snapshot["age"]["latency_buckets"].values()) == sorted(snapshot["age"]["latency_buckets"].values())
+    json.dumps(snapshot)
+
+    disable_instrumentation()
+    is_valid("5", age)
+    assert instrumentation_snapshot()["age"]["calls"] == 5
+    reset_instrumentation()
+    assert instrumentation_snapshot() == {}
+
+def test_instrumentation_prometheus(instrumentation):
+    spec = SpecNumRange(0, 10)
+    enable_instrumentation({'say "hi"\n': spec})
+    is_valid("1", spec)
+    is_valid("", spec)
+
+    lines = instrumentation_prometheus().splitlines()
+    assert 'validation_calls_total{spec="say \\"hi\\"\\n"} 2' in lines
+    assert 'validation_passed_total{spec="say \\"hi\\"\\n"} 1' in lines
+    assert 'validation_failures_total{spec="say \\"hi\\"\\n",category="blank"} 1' in lines
+    assert 'validation_seconds_bucket{spec="say \\"hi\\"\\n",le="+Inf"} 2' in lines
+    assert 'validation_seconds_count{spec="say \\"hi\\"\\n"} 2' in lines
+    assert [line for line in lines if line.startswith("# TYPE")] == [
+        "# TYPE validation_calls_total counter", "# TYPE validation_passed_total counter", "# TYPE validation_failures_total counter", "# TYPE validation_seconds histogram",
+    ]
+
+def test_cached_combinations_follow_changes():
+    inner = SpecNumRange(0, 10)
+    spec = SpecAny.shared([inner]).cache_results()
+    assert is_valid(20, spec)[0] is False
+    inner.max = 100
+    assert is_valid(20, spec)[0] is True
+
+    inner = SpecNumRange(0, 10)
+    spec = SpecNot.shared(inner).cache_results()
+    assert is_valid(20, spec)[0] is True
+    inner.max = 100
+    assert is_valid(20, spec)[0] is False
+
+def test_cached_results_only_for_strings_and_integers():
+    spec = SpecStr.shared(["0.0"]).cache_results()
+    assert is_valid(-0.0, spec) == (False, "-0.0")
+    assert is_valid(0.0, spec) == (True, "0.0")
+
+    spec = SpecStr.shared(["(1,)"]).cache_results()
+    assert is_valid((1,), spec) == (True, "(1,)")
+    assert is_valid((1.0,), spec) == (False, "(1.0,)")
+
+    decimals = SpecStr.shared(["1.0"]).cache_results()
+    assert is_valid(decimal.Decimal("1.00"), decimals) == (False, "1.00")
+    assert is_valid(decimal.Decimal("1.0"), decimals) == (True, "1.0")
+    assert is_valid(True, SpecNum.shared(restrict_to_int=True).cache_results()) == is_valid(True, SpecNum(restrict_to_int=True))
+    assert decimals.cache_info().hits == decimals.cache_info().misses == 0
+
+def test_cached_results_evict_least_recently_used():
+    spec = SpecNumRange.shared(0, 10, None, True).cache_results(2)
+    for value in ["1", "2", "1", "3", 2, "1"]:
+        is_valid(value, spec)
+
+    # remembering "3" forgets "2", which is a different value from 2, then 2 forgets "1" and "1" forgets "3"
+    assert spec.cache_info()[:] == (1, 5, 2, 2)
+    is_valid("3", spec)
+    is_valid("1", spec)
+    assert spec.cache_info()[:] == (2, 6, 2, 2)
+
+    assert spec.cache_results(0).cache_info() is None
+    assert is_valid("1", spec) == (True, 1)
+
+@pytest.mark.parametrize("spec", ARRAY_SPECS, ids=repr)
+def test_is_valid_buffer_matches_is_valid(spec):
+    pytest.importorskip("numpy")
+    values = number_values()
+    expected = [index for index, (valid, value) in enumerate(expected_elementwise(values, spec)) if not valid]
+
+    invalid, positions = is_valid_buffer(array.array("d", values), spec, chunk_size=97)
+
+    assert invalid == len(expected)
+    assert list(positions) == expected
+
+def test_is_valid_buffer_file_and_bitmask(tmp_path):
+    numpy = pytest.importorskip("numpy")
+    spec = SpecNumRange(0, 100, 2)
+    values = number_values()
+    valid = [outcome[0] for outcome in expected_elementwise(values, spec)]
+    path = tmp_path / "numbers"
+    path.write_bytes(b"header" + array.array("d", values).tobytes())
+
+    invalid, bits = is_valid_buffer(str(path), spec, "float64", offset=6, chunk_size=100, bitmask=True)
+
+    assert invalid == valid.count(False)
+    assert list(numpy.unpackbits(bits, bitorder="little")[:len(values)]) == valid
+
+def test_spec_str_file_matches_spec_str(tmp_path):
+    generator = random.Random(2)
+    words = ["".join(generator.choice("abcdeXYZ") for _ in range(generator.randint(1, 6))) for _ in range(300)] + ["a", "ab", "abc", "zzz"]
+    values = words + ["", " ", "q", "a ", " AB", "abcdefgh", "zzzz", "ZZZ", 5, None]
+
+    for to_lower in [True, False]:
+        path = tmp_path / "words{}.txt".format(to_lower)
+        write_vocabulary(words, path, to_lower)
+        from_file = SpecStrFile(path, to_lower)
+        from_list = SpecStr(words if not to_lower else [word.lower() for word in words], to_lower=to_lower)
+        for value in values:
+            assert is_valid(value, from_file) == is_valid(value, from_list), value
+
+def test_spec_str_file_empty(tmp_path):
+    path = tmp_path / "empty.txt"
+    write_vocabulary([], path)
+
+    assert is_valid("", SpecStrFile(path)) == (False, "")
+
+def test_spec_str_file_non_ascii_and_extra_values(tmp_path):
+    path = tmp_path / "words.txt"
+    assert write_vocabulary(["Straße", "éclair", "zebra", "éclair"], path) == 3
+    spec = SpecStrFile(path, extra_values=["n/a"])
+
+    assert is_valid(" ÉCLAIR ", spec) == (True, "éclair")
+    assert is_valid("straße", spec) == (True, "straße")
+    assert is_valid("n/a", spec) == (True, "n/a")
+    assert is_valid("eclair", spec)[0] is False
+    assert str(path) in spec.msg
+
+def test_prefix_validator_matches_allowed_strings():
+    generator = random.Random(3)
+    words = ["".join(generator.choice("abcAB") for _ in range(generator.randint(1, 4))) for _ in range(60)]
+    spec = SpecStr(words, extra_values=["n/a"])
+    prefix_validator = PrefixValidator(spec)
+    allowed = sorted(set([word.lower() for word in words])) + ["n/a"]
+    prefixes = ["".join(generator.choice("abcAB") for _ in range(generator.randint(0, 5))) for _ in range(300)] + ["n", "n/", " a", "z"]
+
+    for prefix in prefixes:
+        key = prefix.lstrip().lower()
+        possible = any([word.startswith(key) for word in allowed[:-1]]) or "n/a".startswith(prefix)
+        assert prefix_validator.check(prefix) == (possible, is_valid(prefix, spec)[0]), prefix
+        suggested = prefix_validator.complete(prefix, 5)
+        assert [item.lower() for item in suggested] == [word for word in allowed if word.startswith(key) and (word != "n/a" or "n/a".startswith(prefix))][:5], prefix
+
+def test_prefix_validator_suggests_as_given():
+    prefix_validator = PrefixValidator(SpecStr(["Apple", "apricot", "Banana"], extra_values=["n/a"]))
+
+    assert prefix_validator.complete("a") == ["Apple", "apricot"]
+    assert prefix_validator.complete("") == ["Apple", "apricot", "Banana", "n/a"]
+    assert prefix_validator.complete("", 2) == ["Apple", "apricot"]
+    assert prefix_validator.check("APX") == (False, False)
+
+    chars = PrefixValidator(SpecStr(allowed_chars=["a", "b"]))
+    assert chars.check("ab") == (True, True)
+    assert chars.check("abc") == (False, False)
+    assert chars.complete("a") == []
+
+def test_prefix_validator_numbers():
+    spec = SpecNumRange(5, 120, restrict_to_int=True)
+    prefix_validator = PrefixValidator(spec)
+    prefixes = [sign + "".join(digits) for sign in ["", "-"] for length in range(4) for digits in itertools.product("0159", repeat=length)]
+
+    for prefix in prefixes:
+        possible, valid = prefix_validator.check(prefix)
+        assert valid == is_valid(prefix, spec)[0], prefix
+        if any([str(number).startswith(prefix) for number in range(5, 121)]):
+            assert possible, prefix
+        suggested = prefix_validator.complete(prefix)
+        assert all([item.startswith(prefix) and is_valid(item, spec)[0] for item in suggested]), prefix
+
+    assert prefix_validator.complete("1") == ["10", "11", "12", "13", "14", "15", "16", "17", "18", "19"]
+    assert prefix_validator.complete("9") == ["9", "90", "91", "92", "93", "94", "95", "96", "97", "98"]
+    assert [prefix_validator.check(prefix) for prefix in ["-", "130", "1.", "12 ", "e"]] == [(False, False), (False, False), (False, False), (True, True), (False, False)]
+
+    listed = PrefixValidator(SpecNumList([1.5, 20, 300]))
+    assert [listed.check(prefix) for prefix in ["1.", "3", "4"]] == [(True, False), (True, False), (False, False)]
+    assert listed.complete("") == ["1.5", "20", "300"]
+
+CACHE_DESCRIPTIONS = {
+    "word": {"class": "SpecStr", "kwargs": {"allowed_strings": ["Word{}".format(number) for number in range(50)]}},
+    "age": {"class": "SpecNumRange", "kwargs": {"min_": 0, "max_": 130, "restrict_to_int": True}},
+    "row": {"class": "SpecRecord", "kwargs": {"fields": {"word": "word", "age": "age"}}},
+}
+
+def cached_specs_counting(*args, **kwargs):
+    # returns the specifications and how many were made rather than loaded from the cache
+    made = []
+    spec_from_json = Validation._spec_from_json
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(Validation, "_spec_from_json", lambda *made_args: made.append(made_args) or spec_from_json(*made_args))
+        specs = cached_specs(*args, **kwargs)
+
+    return specs, len(made)
+
+def test_cached_specs_loads_what_it_made(tmp_path):
+    cache = tmp_path / "specs.cache"
+    specs, made = cached_specs_counting(CACHE_DESCRIPTIONS, cache, file_threshold=10)
+    assert made == 2
+    assert isinstance(specs["word"], SpecStrFile)
+
+    specs, made = cached_specs_counting(CACHE_DESCRIPTIONS, cache, file_threshold=10)
+    assert made == 0
+    assert is_valid({"word": " WORD7", "age": "30"}, specs["row"]) == (True, {"word": "word7", "age": 30})
+    assert is_valid({"word": "word50", "age": "30"}, specs["row"])[0] is False
+    assert sorted(os.listdir(tmp_path)) == ["specs.cache", "specs.cache.0.vocab"]
+
+    path = tmp_path / "descriptions.json"
+    path.write_text(json.dumps(CACHE_DESCRIPTIONS))
+    assert cached_specs_counting(str(path), cache)[1] == 3
+    assert cached_specs_counting(str(path), cache)[1] == 0
+    assert cached_specs_counting(str(path), cache, file_threshold=10)[1] == 2
+
+def test_cached_specs_made_again_when_files_change(tmp_path):
+    cache = tmp_path / "specs.cache"
+    cached_specs(CACHE_DESCRIPTIONS, cache, file_threshold=10)
+
+    # the same size but different strings
+    vocabulary = tmp_path / "specs.cache.0.vocab"
+    stat = os.stat(vocabulary)
+    vocabulary.write_text(vocabulary.read_text().replace("word1", "word9"))
+    os.utime(vocabulary, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert os.path.getsize(vocabulary) == stat.st_size
+    specs, made = cached_specs_counting(CACHE_DESCRIPTIONS, cache, file_threshold=10)
+    assert made == 2
+    assert is_valid("word1", specs["word"]) == (True, "word1")
+
+    cache.write_bytes(b"not a cache")
+    assert cached_specs_counting(CACHE_DESCRIPTIONS, cache, file_threshold=10)[1] == 2
+
+def test_combinations_dont_depend_on_order_learned():
+    # checking 'inf' against an integer specification raises, which counts as not valid whichever is checked first
+    spec_all = SpecAll([SpecNumRange(0, 10, restrict_to_int=True), SpecStr(["a"])])
+    spec_any = SpecAny([SpecNumRange(0, 10, restrict_to_int=True), SpecStr(["inf"])])
+    values = ["a", "5", "x", "inf"] * 2000
+
+    assert {is_valid(value, spec_all) for value in values if value == "inf"} == {(False, "inf")}
+    assert {is_valid(value, spec_any) for value in values if value == "inf"} == {(True, "inf")}
+    assert [is_valid(value, spec_all) for value in values] == [(False, value) for value in values]
+    assert [is_valid(value, spec_any) for value in values] == [(value in ("5", "inf"), int(value) if value == "5" else value) for value in values]
+
+def test_combinations_learn_which_decides_first():
+    # the string never matches so the range decides every value and is checked first once that has been learned
+    spec = SpecAny([SpecStr(["x"]), SpecNumRange(0, 10, restrict_to_int=True)])
+    for number in range(20000):
+        assert is_valid(str(number % 10), spec) == (True, number % 10)
+
+    stats = spec.ordering_stats()
+    assert stats["order"] == [1, 0]
+    assert stats["specs"][0]["passed"] == 0
+    assert stats["specs"][1]["passed"] == stats["specs"][1]["checked"] > 0
+
+def run_piped(script, stdin):
+    return subprocess.run([sys.executable, "-c", "from Validation import *\n" + script], cwd=HERE, input=stdin, capture_output=True, text=True)
+
+def test_batch_input_after_input():
+    result = run_piped("name = input()\nprint(name, validate_input(SpecNumRange(0, 120, restrict_to_int=True)))", "bob\n42\n")
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == "bob 42\n"
+
+def test_input_after_batch_input():
+    result = run_piped("print(true_false())\nprint(input())\nprint(validate_input(SpecStr(['a'])), input())", "yes\nnext\nb\na\nlast")
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines() == ["True", "next", SpecStr(["a"]).msg, "a last"]
+
+def test_batch_input_ends():
+    result = run_piped("try:\n    validate_input(SpecStr(['a']))\nexcept BatchInputError as error:\n    print(len(error.rejected))", "x\ny\n")
+
+    assert result.stdout.splitlines()[-1] == "2"
+
+def test_batch_input_shows_prompt_before_reading():
+    # answers each prompt only once it has been shown, as a program driving another through pipes does
+    script = "from Validation import *\nprint(validate_input(SpecNumRange(0, 120, restrict_to_int=True), 'Age? '))"
+    process = subprocess.Popen([sys.executable, "-c", script], cwd=HERE, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    timer = threading.Timer(30, process.kill)
+    timer.start()
+    try:
+        assert process.stdout.read(5) == "Age? "
+        process.stdin.write("500\n")
+        process.stdin.flush()
+        message = SpecNumRange(0, 120, restrict_to_int=True).msg
+        assert process.stdout.read(len(message) + 6) == message + "\nAge? "
+        process.stdin.write("42\n")
+        process.stdin.close()
+        assert process.stdout.read() == "42\n"
+    finally:
+        timer.cancel()
+        process.kill()
+        process.wait()
+        process.stdin.close()
+        process.stdout.close()
@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+import Validation
+from ValidationBenchmarks import compare_benchmarks, run_benchmarks
+
+def test_run_benchmarks_only_those_named():
+    results = run_benchmarks(["SpecNot", "SpecStrFile"], repeat=1, min_time=0)
+
+    assert sorted(results["results"]) == [
+        "construct SpecNot", "construct SpecStrFile", "is_valid SpecNot list", "is_valid SpecNot range", "is_valid SpecStrFile all valid", "is_valid SpecStrFile half valid",
+    ]
+    assert all([result["per_second"] > 0 for result in results["results"].values()])
+
+def test_compare_benchmarks():
+    baseline = {"results": {"a": {"per_second": 100}, "b": {"per_second": 100}, "c": {"per_second": 100}}}
+    results = {"results": {"a": {"per_second": 95}, "b": {"per_second": 50}, "d": {"per_second": 1}}}
+
+    assert compare_benchmarks(results, baseline) == {"b": {"baseline": 100, "per_second": 50, "changed": -0.5}}
+    assert sorted(compare_benchmarks(results, baseline, 0.01)) == ["a", "b"]
+
+def test_bench_command(tmp_path, capsys):
+    output = str(tmp_path / "results.json")
+    Validation.main(["bench", "--repeat", "1", "--output", output, "construct SpecNot"])
+    with open(output) as file:
+        results = json.load(file)
+    assert list(results["results"]) == ["construct SpecNot"]
+
+    results["results"]["construct SpecNot"]["per_second"] *= 1000
+    with open(output, "w") as file:
+        json.dump(results, file)
+    with pytest.raises(SystemExit) as exited:
+        Validation.main(["bench", "--repeat", "1", "--compare", output, "construct SpecNot"])
+    assert exited.value.code == 1
+    assert "SLOWER construct SpecNot" in capsys.readouterr().err